@@ -1,6 +1,7 @@
 # src/main.py
 import sys
 import signal
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 
 # Import the MainWindow class from your GUI application file
@@ -26,4 +27,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the certificate process pool in PyInstaller builds
+    multiprocessing.freeze_support()
     main()
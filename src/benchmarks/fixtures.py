@@ -0,0 +1,94 @@
+# src/benchmarks/fixtures.py
+"""
+Synthetic data.json fixtures for the benchmarks.
+The data is generated from a fixed seed, so every run measures the same input.
+"""
+import json
+import random
+from typing import Any, Dict
+
+from src.config import settings
+
+FIRST_NAMES = [
+    "Anna", "Katarzyna", "Małgorzata", "Agnieszka", "Barbara", "Ewa", "Krystyna",
+    "Elżbieta", "Zofia", "Joanna", "Żaneta", "Jadwiga", "Łucja", "Grażyna",
+    "Piotr", "Krzysztof", "Andrzej", "Tomasz", "Paweł", "Józef", "Marcin",
+    "Łukasz", "Michał", "Grzegorz", "Wojciech", "Mikołaj", "Bartłomiej", "Zdzisław",
+]
+LAST_NAMES = [
+    "Nowak", "Kowalski", "Wiśniewski", "Wójcik", "Kowalczyk", "Kamiński",
+    "Lewandowski", "Zieliński", "Szymański", "Woźniak", "Dąbrowski", "Kozłowski",
+    "Jankowski", "Mazur", "Wojciechowski", "Kwiatkowski", "Krawczyk", "Kaczmarek",
+    "Piotrowski", "Grabowski", "Zając", "Pawłowski", "Michalski", "Król",
+    "Wieczorek", "Jabłoński", "Wróbel", "Nowakowski", "Majewski", "Olszewski",
+    "Stępień", "Jaworski", "Malinowski", "Górski", "Sikora", "Baran",
+    "Brzęczyszczykiewicz", "Przybyłowicz-Szczepańska",
+]
+BIRTH_PLACES = [
+    "Kraków", "Wieliczka", "Warszawa", "Łódź", "Wrocław", "Poznań", "Gdańsk",
+    "Szczecin", "Bielsko-Biała", "Nowy Sącz", "Tarnów", "Zakopane", "Myślenice",
+    "Skawina", "Oświęcim", "Częstochowa", "Rzeszów", "Kielce",
+]
+SCHOOLS = [
+    "Szkoła Podstawowa nr 34 im. Marii Konopnickiej w Krakowie",
+    "Zespół Szkolno-Przedszkolny nr 11 w Wieliczce",
+    "Liceum Ogólnokształcące im. Mikołaja Kopernika",
+]
+TOPICS = [
+    "Wsparcie dziecka o specjalnych potrzebach edukacyjnych w klasie ogólnodostępnej.",
+    "Opracowanie indywidualnego programu edukacyjno-terapeutycznego (IPET) krok po kroku.",
+    "Wielospecjalistyczna ocena poziomu funkcjonowania ucznia (WOPFU) – zasady i dobre praktyki.",
+    "Dostosowanie wymagań edukacyjnych do możliwości psychofizycznych ucznia.",
+    "Współpraca z rodzicami oraz poradnią psychologiczno-pedagogiczną.",
+    "Dokumentowanie pracy zespołu nauczycieli i specjalistów, ewaluacja działań.",
+    "Studium przypadku: uczeń ze spektrum autyzmu, afazją oraz trudnościami w zachowaniu.",
+]
+
+SIZES = (10, 100, 1_000, 10_000)
+
+
+def make_participant(rng: random.Random) -> Dict[str, Any]:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    if first.endswith("a") and last.endswith("ski"):
+        last = last[:-1] + "a"
+    name = f"{first} {last}"
+    return {
+        settings.KEY_IMIE_NAZWISKO: name,
+        settings.KEY_MIEJSCE_URODZENIA: rng.choice(BIRTH_PLACES),
+        settings.KEY_DATA_URODZENIA: f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(1955, 2001)} r.",
+        settings.KEY_SORTING_NAME: name.lower(),
+        settings.KEY_EMAIL: None,
+        settings.KEY_UUID: None,
+        settings.KEY_GENERATED_TIMESTAMP: None,
+    }
+
+
+def make_tematyka(rng: random.Random, paragraphs: int = 6) -> str:
+    """A long, multi-line `tematyka` such as the instructors paste in."""
+    return "\n".join(
+        " ".join(rng.sample(TOPICS, 4)) for _ in range(paragraphs)
+    )
+
+
+def make_data_json(participant_count: int, seed: int = 2025) -> Dict[str, Any]:
+    """Builds a data.json dictionary with `participant_count` participants."""
+    rng = random.Random(seed)
+    return {
+        settings.KEY_PARTICIPANTS: [make_participant(rng) for _ in range(participant_count)],
+        settings.KEY_TRAINING: {
+            settings.KEY_NUMER_SZKOLENIA: "SzRP/25/117",
+            settings.KEY_NAZWA_SZKOLENIA: "Opracowanie dokumentacji IPET i WOPFU – wsparcie ucznia o specjalnych potrzebach edukacyjnych",
+            settings.KEY_MIEJSCE_SZKOLENIA: rng.choice(SCHOOLS),
+            settings.KEY_DATA_SZKOLENIA: "10.10.2025",
+            settings.KEY_PROWADZACY: "Małgorzata Cużytek",
+            settings.KEY_CZAS_TRWANIA: "4h",
+            settings.KEY_CZAS_TRWANIA_OD_DO: "15:30 - 18:30",
+            settings.KEY_DATA_WYSTAWIENIA: "11.10.2025",
+            settings.KEY_TEMATYKA: make_tematyka(rng),
+        },
+    }
+
+
+def write_data_json(participant_count: int, output_path: str, seed: int = 2025):
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(make_data_json(participant_count, seed), f, indent=4, ensure_ascii=False)
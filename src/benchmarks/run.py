@@ -0,0 +1,279 @@
+# src/benchmarks/run.py
+"""
+Reproducible benchmarks for the PDF generation pipeline.
+
+Every (case, size) pair runs in a fresh Python process, so the reported peak RSS
+belongs to that measurement alone and caches from earlier cases do not leak in.
+The caches a run fills are also emptied before each of its --repeat runs.
+
+Usage:
+    python -m src.benchmarks.run                            # all cases, all sizes
+    python -m src.benchmarks.run --cases logbook --sizes 10 100
+    python -m src.benchmarks.run --save baseline.json
+    python -m src.benchmarks.run --compare baseline.json    # exit code 1 on regressions
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+
+from src.benchmarks.fixtures import SIZES, make_data_json
+from src.config import settings
+
+_PAGE_PATTERN = re.compile(rb"/Type /Page\b(?!s)")
+
+
+def _count_pages(pdf: bytes) -> int:
+    return len(_PAGE_PATTERN.findall(pdf))
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ==============================================================================
+# SECTION: CASES
+# ==============================================================================
+# Each case gets the fixture and returns (seconds, units, pages).
+
+def bench_table_layout(data_json: Dict[str, Any]) -> tuple[float, int, int]:
+    """my_table on the logbook participant list, drawn onto a canvas that is never saved."""
+    from src.pdf_generation.tables import my_table
+
+    training = data_json[settings.KEY_TRAINING]
+    rows = [["", "Imie i nazwisko", "Data urodzenia", "Miejsce urodzenia", "Placówka"]]
+    rows.extend([
+        i + 1,
+        p[settings.KEY_IMIE_NAZWISKO],
+        p[settings.KEY_DATA_URODZENIA],
+        p[settings.KEY_MIEJSCE_URODZENIA],
+        training[settings.KEY_MIEJSCE_SZKOLENIA],
+    ] for i, p in enumerate(data_json[settings.KEY_PARTICIPANTS]))
+
+    c = canvas.Canvas(io.BytesIO(), pagesize=A4)
+    start = time.perf_counter()
+    my_table(c, rows, 0, A4[1] - 3.5 * cm, [1 * cm, 6 * cm, 3 * cm, 4 * cm, 5 * cm], center_table=True)
+    seconds = time.perf_counter() - start
+    return seconds, len(rows) - 1, c.getPageNumber()
+
+
+def bench_table_merges(data_json: Dict[str, Any]) -> tuple[float, int, int]:
+    """my_table on the participant list with a merge every few rows: vertical, horizontal and block spans."""
+    from src.pdf_generation.tables import my_table
+
+    training = data_json[settings.KEY_TRAINING]
+    rows = [["", "Imie i nazwisko", "Data urodzenia", "Miejsce urodzenia", "Placówka"]]
+    rows.extend([
+        i + 1,
+        p[settings.KEY_IMIE_NAZWISKO],
+        p[settings.KEY_DATA_URODZENIA],
+        p[settings.KEY_MIEJSCE_URODZENIA],
+        training[settings.KEY_MIEJSCE_SZKOLENIA],
+    ] for i, p in enumerate(data_json[settings.KEY_PARTICIPANTS]))
+    merges = []
+    for start in range(1, len(rows) - 5, 6):
+        merges.append(((start, 4), (start + 2, 4)))          # the same school over three rows
+        merges.append(((start + 3, 2), (start + 3, 3)))      # date and place side by side
+        merges.append(((start + 4, 1), (start + 5, 2)))      # a two by two block
+
+    c = canvas.Canvas(io.BytesIO(), pagesize=A4)
+    start = time.perf_counter()
+    my_table(c, rows, 0, A4[1] - 3.5 * cm, [1 * cm, 6 * cm, 3 * cm, 4 * cm, 5 * cm], merge_cells=merges, center_table=True)
+    seconds = time.perf_counter() - start
+    return seconds, len(rows) - 1, c.getPageNumber()
+
+
+def bench_certificate(data_json: Dict[str, Any]) -> tuple[float, int, int]:
+    """Every participant's certificate rendered on its own canvas, in memory."""
+    from src.pdf_generation.generator import CertificateTemplate, _assign_uuids, render_certyfikat
+
+    training = data_json[settings.KEY_TRAINING]
+    participants = data_json[settings.KEY_PARTICIPANTS]
+    _assign_uuids(training, participants)
+
+    start = time.perf_counter()
+    template = CertificateTemplate(training)
+    pages = sum(_count_pages(render_certyfikat(training, p, template=template)) for p in participants)
+    seconds = time.perf_counter() - start
+    return seconds, len(participants), pages
+
+
+def bench_logbook(data_json: Dict[str, Any]) -> tuple[float, int, int]:
+    """The full dziennik.pdf, rendered in memory."""
+    from src.pdf_generation.generator import render_dziennik
+
+    start = time.perf_counter()
+    pdf = render_dziennik(data_json[settings.KEY_TRAINING], data_json[settings.KEY_PARTICIPANTS])
+    seconds = time.perf_counter() - start
+    return seconds, 1, _count_pages(pdf)
+
+
+def bench_generate(data_json: Dict[str, Any]) -> tuple[float, int, int]:
+    """End-to-end generate() into a temporary directory, including disk writes."""
+    from src.pdf_generation.generator import generate
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate(data_json, output_dir, force=True)
+        seconds = time.perf_counter() - start
+
+        pages = 0
+        for root, _, files in os.walk(output_dir):
+            for name in files:
+                with open(os.path.join(root, name), "rb") as f:
+                    pages += _count_pages(f.read())
+    return seconds, len(data_json[settings.KEY_PARTICIPANTS]), pages
+
+
+CASES: Dict[str, tuple[Callable[[Dict[str, Any]], tuple[float, int, int]], str]] = {
+    "table_layout": (bench_table_layout, "rows"),
+    "table_merges": (bench_table_merges, "rows"),
+    "certificate": (bench_certificate, "certificates"),
+    "logbook": (bench_logbook, "logbooks"),
+    "generate": (bench_generate, "certificates"),
+}
+
+
+# ==============================================================================
+# SECTION: RUNNER
+# ==============================================================================
+
+def _clear_caches():
+    """Empties the caches a run fills, so every repeat starts as cold as the first one."""
+    from src.pdf_generation.asset_cache import clear_image_cache
+    from src.pdf_generation.metrics import clear_advance_tables
+    from src.pdf_generation.tables import clear_layout_cache
+
+    clear_layout_cache()
+    clear_image_cache()
+    clear_advance_tables()
+
+
+def run_case(case: str, size: int, repeat: int) -> Dict[str, Any]:
+    """Runs one case in this process and returns the best of `repeat` runs."""
+    from src.pdf_generation.generator import register_font
+
+    register_font()
+    function, unit = CASES[case]
+    best = None
+    for _ in range(repeat):
+        _clear_caches()
+        seconds, units, pages = function(make_data_json(size))
+        if best is None or seconds < best[0]:
+            best = (seconds, units, pages)
+    seconds, units, pages = best
+    return {
+        "case": case,
+        "size": size,
+        "seconds": seconds,
+        "unit": unit,
+        "units_per_s": units / seconds if seconds else None,
+        "pages": pages,
+        "pages_per_s": pages / seconds if seconds else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_isolated(case: str, size: int, repeat: int) -> Dict[str, Any]:
+    """Runs one case in a fresh interpreter so peak RSS and caches are per measurement."""
+    completed = subprocess.run(
+        [sys.executable, "-m", "src.benchmarks.run", "--child", case, str(size), "--repeat", str(repeat)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def compare(results: list[Dict[str, Any]], baseline: list[Dict[str, Any]], threshold: float) -> list[str]:
+    """Annotates `results` with the change against `baseline` and returns the regressions."""
+    previous = {(r["case"], r["size"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get((result["case"], result["size"]))
+        if not old or not old["seconds"]:
+            result["change"] = None
+            continue
+        change = result["seconds"] / old["seconds"] - 1
+        result["change"] = change
+        if change > threshold:
+            regressions.append(
+                f"{result['case']} @ {result['size']}: {old['seconds']:.3f}s -> {result['seconds']:.3f}s ({change:+.0%})"
+            )
+    return regressions
+
+
+def print_report(results: list[Dict[str, Any]]):
+    header = f"{'case':<14}{'size':>8}{'seconds':>10}{'throughput':>24}{'pages/s':>10}{'peak RSS':>11}{'change':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        throughput = f"{r['units_per_s']:.1f} {r['unit']}/s" if r["units_per_s"] else "-"
+        pages = f"{r['pages_per_s']:.1f}" if r["pages_per_s"] else "-"
+        rss = f"{r['peak_rss_mb']:.0f} MB" if r["peak_rss_mb"] is not None else "-"
+        change = f"{r['change']:+.0%}" if r.get("change") is not None else ""
+        print(f"{r['case']:<14}{r['size']:>8}{r['seconds']:>10.3f}{throughput:>24}{pages:>10}{rss:>11}{change:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PDF generation pipeline.")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES), help="Participant counts.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, the best one is kept.")
+    parser.add_argument("--save", type=str, help="Write the results to this JSON file.")
+    parser.add_argument("--compare", type=str, help="Compare against a JSON file written by --save.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Slowdown reported as a regression.")
+    parser.add_argument("--child", nargs=2, metavar=("CASE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        case, size = args.child
+        print(json.dumps(run_case(case, int(size), args.repeat)))
+        return
+
+    results = []
+    for size in args.sizes:
+        for case in args.cases:
+            print(f"Running {case} @ {size}...", file=sys.stderr)
+            results.append(run_isolated(case, size, args.repeat))
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+
+    print_report(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version, "results": results}, f, indent=4)
+        print(f"Results saved to {args.save}")
+
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# src/benchmarks/wrap.py
+"""
+Micro-benchmark for table cell wrapping: the linear tables._wrap_words against
+the previous implementation that re-measured the whole growing line for every word.
+
+Usage:
+    python -m src.benchmarks.wrap
+    python -m src.benchmarks.wrap --words 5000 20000 --width 5
+"""
+import argparse
+import random
+import time
+
+from reportlab.lib.units import cm
+from reportlab.pdfbase import pdfmetrics
+
+from src.benchmarks.fixtures import TOPICS
+from src.config import settings
+
+
+def wrap_quadratic(text, available_width_for_text, font_name, font_size) -> list[str]:
+    """The wrapping loop as it was before tables._wrap_words, kept as the reference."""
+    lines = []
+    raw_lines = str(text).split("\n")
+    words = []
+    for line in raw_lines:
+        words.extend(line.split(" "))
+        words.append("\n")
+    words.pop()
+
+    current_line_words = []
+    for word in words:
+        if word == "\n":
+            lines.append(" ".join(current_line_words))
+            current_line_words = []
+            continue
+
+        potential_line = " ".join(current_line_words + [word])
+        potential_width = pdfmetrics.stringWidth(potential_line, font_name, font_size)
+
+        if potential_width > available_width_for_text and current_line_words:
+            lines.append(" ".join(current_line_words))
+            current_line_words = [word]
+        else:
+            current_line_words.append(word)
+
+    if current_line_words:
+        lines.append(" ".join(current_line_words))
+    return lines if lines else [""]
+
+
+def make_cell_text(words: int, seed: int = 2025) -> str:
+    """A paragraph of `words` words taken from the fixture topics, with a few forced line breaks."""
+    rng = random.Random(seed)
+    vocabulary = " ".join(TOPICS).split()
+    picked = rng.choices(vocabulary, k=words)
+    for i in range(0, words, 500):
+        picked[i] += "\n"
+    return " ".join(picked)
+
+
+def _best_of(function, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def main():
+    from src.pdf_generation.generator import register_font
+    from src.pdf_generation.tables import _wrap_words
+
+    parser = argparse.ArgumentParser(description="Benchmark table cell wrapping.")
+    parser.add_argument("--words", nargs="+", type=int, default=[500, 5_000])
+    parser.add_argument("--width", type=float, default=15, help="Cell width in cm.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, the best one is kept.")
+    args = parser.parse_args()
+
+    register_font()
+    font_name, font_size = settings.FONT_NAME, 10
+    width = args.width * cm
+
+    print(f"{'words':>8}{'lines':>8}{'quadratic':>12}{'linear':>10}{'speedup':>10}")
+    for words in args.words:
+        text = make_cell_text(words)
+        expected = wrap_quadratic(text, width, font_name, font_size)
+        result = _wrap_words(text, width, font_name, font_size)
+        if result != expected:
+            raise SystemExit(f"Wrapped lines differ for {words} words")
+
+        old = _best_of(lambda: wrap_quadratic(text, width, font_name, font_size), args.repeat)
+        new = _best_of(lambda: _wrap_words(text, width, font_name, font_size), args.repeat)
+        print(f"{words:>8}{len(result):>8}{old:>11.3f}s{new:>9.3f}s{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
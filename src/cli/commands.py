@@ -1,36 +1,83 @@
 # src/cli/commands.py
 import argparse
+import json
 import os
 from src.config import settings
-from src.project_managment.file_ops import load_json_data
-from src.pdf_generation.generator import generate_logbook, generate_certificates
+from src.project_managment.file_ops import load_json_data, save_json_data
+from src.pdf_generation.generator import estimate, generate
+from src.data_conversion.survey_store import GROUP_COLUMNS, SurveyStore, import_archives
 
-def handle_generate(args):
-    """Handler for the 'generate' command."""
-    if not os.path.isdir(args.directory):
-        print(f"Error: Directory not found at '{args.directory}'")
-        return
+def _load_project(directory: str):
+    if not os.path.isdir(directory):
+        print(f"Error: Directory not found at '{directory}'")
+        return None
 
-    json_path = os.path.join(args.directory, settings.DATA_FILENAME)
+    json_path = os.path.join(directory, settings.DATA_FILENAME)
     data = load_json_data(json_path)
 
     if not data:
         print(f"Could not load data from {json_path}. Aborting.")
-        return
+        return None
+    return data
 
-    if args.all or args.logbook:
-        print("Generating logbook...")
-        generate_logbook(data, args.directory)
+def _format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
 
-    if args.all or args.certificates:
-        print("Generating certificates...")
-        generate_certificates(data, args.directory)
-        # Note: The CLI version doesn't automatically save back timestamps.
-        # This would be a feature to add.
+def handle_generate(args):
+    """Handler for the 'generate' command."""
+    data = _load_project(args.directory)
+    if data is None:
+        return
+
+    print("Generating logbook and certificates...")
+    updated_data = generate(data, args.directory, force=args.force, workers=args.workers, single_file=args.single_file)
+    # Save the generation records, so the next run skips unchanged documents
+    save_json_data(updated_data, os.path.join(args.directory, settings.DATA_FILENAME))
 
     print("Generation complete.")
 
-def setup_cli():
+def handle_estimate(args):
+    """Handler for the 'estimate' command: page counts and sizes without rendering."""
+    data = _load_project(args.directory)
+    if data is None:
+        return
+
+    documents = estimate(data, single_file=args.single_file)
+
+    if args.json:
+        print(json.dumps(documents, indent=4))
+        return
+
+    for name, document in documents.items():
+        print(f"{name:<20}{document['files']:>6} file(s){document['pages']:>8} pages   ~{_format_size(document['size'])}")
+    total_pages = sum(document["pages"] for document in documents.values())
+    total_size = sum(document["size"] for document in documents.values())
+    print(f"{'Total':<28}{'':>6}{total_pages:>8} pages   ~{_format_size(total_size)}")
+
+def handle_surveys(args):
+    """Handler for the 'surveys' command: mean ratings across imported surveys."""
+    with SurveyStore(args.store) as store:
+        if args.import_archives:
+            added = import_archives(store, args.import_archives)
+            print(f"Imported {added} new survey(s) from {args.import_archives}")
+
+        filters = {key: getattr(args, key) for key in ("year", "instructor", "training") if getattr(args, key)}
+        rows = store.rating_summary(tuple(args.group_by), **filters)
+
+    if args.json:
+        print(json.dumps(rows, indent=4, ensure_ascii=False))
+        return
+
+    for row in rows:
+        group = "  ".join(str(row[key]) for key in args.group_by) or "All"
+        mean = f"{row['mean']:.2f}" if row["mean"] is not None else "-"
+        print(f"{group:<40}{row['surveys']:>6} survey(s){row['ratings']:>8} ratings   mean {mean}")
+
+def setup_cli() -> argparse.ArgumentParser:
     """Sets up the command-line argument parser."""
     parser = argparse.ArgumentParser(description="Training Data Manager CLI.")
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -38,15 +85,36 @@ def setup_cli():
     # Generate command
     gen_parser = subparsers.add_parser("generate", help="Generate PDF documents.")
     gen_parser.add_argument("directory", type=str, help="Path to the training directory.")
-    gen_parser.add_argument("--all", action="store_true", help="Generate all documents.")
-    gen_parser.add_argument("--logbook", action="store_true", help="Generate only the logbook.")
-    gen_parser.add_argument("--certificates", action="store_true", help="Generate only the certificates.")
+    gen_parser.add_argument("--force", action="store_true", help="Regenerate documents that are up to date.")
+    gen_parser.add_argument("--single-file", action="store_true", help="Certificates in one PDF.")
+    gen_parser.add_argument("--workers", type=int, default=1, help="Processes rendering certificates, 0 for all cores.")
     gen_parser.set_defaults(func=handle_generate)
 
-    # To use this:
-    # args = parser.parse_args()
-    # args.func(args)
+    # Estimate command
+    est_parser = subparsers.add_parser("estimate", help="Estimate page counts and sizes without rendering.")
+    est_parser.add_argument("directory", type=str, help="Path to the training directory.")
+    est_parser.add_argument("--single-file", action="store_true", help="Certificates in one PDF.")
+    est_parser.add_argument("--json", action="store_true", help="Print the estimate as JSON.")
+    est_parser.set_defaults(func=handle_estimate)
+
+    # Surveys command
+    srv_parser = subparsers.add_parser("surveys", help="Mean survey ratings across trainings.")
+    srv_parser.add_argument("--store", type=str, default=settings.SURVEY_STORE_PATH, help="Path to the survey store.")
+    srv_parser.add_argument("--import-archives", type=str, nargs="?", const=settings.DEFAULT_TRAINING_ROOT, metavar="ROOT",
+                            help="First add the archived surveys of all trainings under ROOT.")
+    srv_parser.add_argument("--group-by", nargs="*", default=["instructor"], choices=list(GROUP_COLUMNS))
+    srv_parser.add_argument("--year", type=str, help="Only trainings of this year.")
+    srv_parser.add_argument("--instructor", type=str, help="Only trainings of this instructor.")
+    srv_parser.add_argument("--training", type=str, help="Only this training number.")
+    srv_parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    srv_parser.set_defaults(func=handle_surveys)
+
+    return parser
+
+def main():
+    args = setup_cli().parse_args()
+    args.func(args)
 
-# Example of how to run from main.py if you add CLI logic:
-# if __name__ == "__main__":
-#     setup_cli()
+# Usage: python -m src.cli.commands estimate <training directory>
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ Central configuration file for the application.
 Contains constants, file paths, and UI definitions.
 """
 from pathlib import Path
-from platformdirs import user_documents_dir
+from platformdirs import user_cache_dir, user_documents_dir
 import sys
 
 def get_resource_path(relative_path: str) -> Path:
@@ -30,20 +30,32 @@ def get_resource_path(relative_path: str) -> Path:
 # Assuming the script runs from the project root. Adjust if needed.
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 ASSETS_DIR = Path(__file__).parent.parent / "pdf_generation" / "assets"
+CONFIG_DIR = Path(__file__).parent
 # This path might need to be adjusted based on where you store data
 DEFAULT_TRAINING_ROOT = f"{user_documents_dir()}/generated_certificates"
+# Results of all imported evaluation surveys, for trends across trainings
+SURVEY_STORE_PATH = f"{DEFAULT_TRAINING_ROOT}/ankiety.sqlite3"
+# Parsed font tables etc. that are expensive to rebuild on every start
+CACHE_DIR = user_cache_dir("pdf_generator")
 
 ARCHIVE_SUBDIR = "archiwum"
 LISTA_OBECNOSCI_FILENAME = "lista_obecnosci.ods"
 ANKIETA_EWALUACYJNA_FILENAME = "ankieta_ewaluacyjna.ods"
 ANKIETA_EWALUACYJNA_OUTPUT = "ankieta_ewaluacyjna_output.txt"
 SURVEY_FILENAME = "ankieta.ods"
+# Column classification of the evaluation survey, a copy in the training directory overrides it
+SURVEY_SCHEMA_FILENAME = "survey_schema.json"
+SURVEY_SCHEMA_PATH = str(get_resource_path(str(CONFIG_DIR / SURVEY_SCHEMA_FILENAME)))
 DATA_FILENAME = "data.json"
 DATA_COMPARE_FILENAME = "data.json.old"
 CERTIFICATES_DIR_NAME = "certyfikaty"
+CERTIFICATES_FILENAME = "certyfikaty.pdf"
 LOGBOOK_FILENAME = "dziennik.pdf"
 FONT_PATH = str(get_resource_path(str(ASSETS_DIR / "DejaVuSans.ttf")))
 FONT_NAME = "DejaVuSans"
+FONT_CACHE_DIR = f"{CACHE_DIR}/fonts"
+LAYOUT_CACHE_SIZE = 4096  # Wrapped cell texts kept in memory during a generate() run
+DATE_CACHE_SIZE = 32768  # Distinct birth dates remembered by ods_parser.fix_date
 IMAGE_LOGO_PATH = str(get_resource_path(str(ASSETS_DIR / "logo.png")))
 IMAGE_STAMP_PATH = str(get_resource_path(str(ASSETS_DIR / "podpis.png")))
 
@@ -54,6 +66,7 @@ KEY_IMIE_NAZWISKO = "imie_nazwisko"
 KEY_MIEJSCE_URODZENIA = "miejsce_urodzenia"
 KEY_DATA_URODZENIA = "data_urodzenia"
 KEY_GENERATED_TIMESTAMP = "generated"
+KEY_GENERATED_HASH = "generated_hash"
 KEY_SORTING_NAME = "sorting_name"
 KEY_EMAIL = "email"
 KEY_UUID = "UUID"
@@ -72,6 +85,7 @@ KEY_TEMATYKA = "tematyka"
 # Top-level keys
 KEY_TRAINING = "Szkolenie"
 KEY_PARTICIPANTS = "Osoby"
+KEY_DOCUMENTS = "Dokumenty"  # Generation records of shared documents, keyed by file name
 
 
 # --- UI DEFINITIONS ---
@@ -1,129 +1,340 @@
-import ezodf
-from statistics import mean
+import functools
+import json
+import math
+import os
+import re
+import statistics
+from array import array
 from collections import Counter
-import os # Import os for potential path manipulation, though not strictly needed here
+from fractions import Fraction
+from typing import Any
+
+from src.config import settings
+from src.data_conversion.ods_reader import iter_rows
 
 ods_path = "/home/john/Projects/Work/Pyhton/pdf_generator_for_mom_2_1/Ankieta ewaluacyjna_ZSP11_ Opracowanie dokumencji_ IPET, WOPFU (O.ods"
 
-keys_average = (
-    "Tematyka szkolenia dostosowana została do zgłoszonych potrzeb (1 - najniższa ocena, 5 najwyższa ocena):"
-    "Czas trwania zajęć dostosowany był do potrzeb uczestników (1 - najniższa ocena, 5 najwyższa ocena):"
-    "Na ile ocenia Pan/Pani przygotowanie merytoryczne trenera / edukatora (1 - najniższa ocena, 5 najwyższa ocena):"
-    "Na ile trener zrealizował cele szkolenia (1 - najniższa ocena, 5 najwyższa ocena): "
-    "Jak ocenia Pan / Pani sposób prowadzenia zajęć przez trenera / edukatora (1 - najniższa ocena, 5 najwyższa ocena): "
-    "Na ile trener / edukator odpowiadał na potrzeby zgłaszane przez uczestników   (1 - najniższa ocena, 5 najwyższa ocena): "
-)
-key_lista = "Dodatkowe uwagi dla trenera/ edukatora lub placówki"
-key_tak_nie = "Czy polecił/a by Pan/Pani kurs innym?"
-key_sorting = "Jakie inne szkolenia byłyby interesujące dla Pana/ Pani w przyszłości - można zaznaczyć kilka odpowiedzi:"
-
-multi_choice_key = [
-    "Wsparcie dziecka o SPE: spektrum autyzmu, afazja, niepełnosprawność intelektualna",
-    "Wsparcie dziecka o SPE: dysleksja, dysgrafia, dysortografia, dyskalkulia",
-    "Wsparcie dziecka z problemami emocjonalnymi: depresja, zaburzenia lękowe, doświadczenia postraumatyczne, uzależnienia od urządzeń ekranowych",
-    "Wsparcie dziecka z trudnościami w zachowaniu: bunt, agresja, przemoc rówieśnicza",
-    "Zagrożenia dla rozwoju współczesnego dziecka/ nastolatka: używki, uzależnienia behawioralne",
-    "Wspomaganie pamięci i koncentracji uczniów",
-    "TIK w pracy nauczyciela",
-    "Bezpieczeństwo w sieci uczniów i nauczycieli",
-    "Prawo oświatowe",
-    "Stres w pracy, wzmacnianie odporności psychicznej i dobrostanu nauczycieli",
-    "Praca z klasą zróżnicowaną kulturowo (uczeń z zagranicy z zespole klasowym)",
-    "Praca z klasą zróżnicowaną edukacyjnie",
-    'Praca z klasą "trudną" (konflikty, kłopoty z dyscypliną, brak aktywności, słaba motywacja)',
-    "Ciekawe lekcje wychowawcze",
-    'Współpraca z rodzicami (w tym z "wymagającym" rodzicem)',
-]
-
-def read_ma_file(file_path: str):
+# Scores of the 1 - 5 rating questions, counted in the histogram of a rating column
+RATING_SCORES = (1, 2, 3, 4, 5)
+# Keys of a rating column summary, they are also its labels in the report
+RATING_MEAN = "średnia"
+RATING_MEDIAN = "mediana"
+RATING_STDEV = "odchylenie standardowe"
+RATING_COUNT = "liczba ocen"
+RATING_MISSING = "brak oceny"
+RATING_SCORE = "ocena {}"
+
+
+class _RatingColumn:
+    """
+    Statistics of the values that convert to float: mean, median, standard deviation,
+    a histogram of the 1 - 5 scores and the number of responses without a rating.
+    The values are kept in an array("d"), 8 bytes each, for the median.
+    The sums of the values and of their squares are kept exact per denominator, as
+    statistics.mean does, so the mean and deviation need no pass over the values.
+    """
+    __slots__ = ("values", "partials", "squares", "non_finite", "histogram")
+
+    def __init__(self):
+        self.values = array("d")
+        self.partials = {}
+        self.squares = {}
+        self.non_finite = None
+        self.histogram = dict.fromkeys(RATING_SCORES, 0)
+
+    def add(self, value):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return
+        self.values.append(value)
+        if value in self.histogram:
+            self.histogram[value] += 1
+        if math.isfinite(value):
+            numerator, denominator = value.as_integer_ratio()
+            self.partials[denominator] = self.partials.get(denominator, 0) + numerator
+            self.squares[denominator] = self.squares.get(denominator, 0) + numerator * numerator
+        else:
+            self.non_finite = value if self.non_finite is None else self.non_finite + value
+
+    def _total(self) -> Fraction:
+        return sum(Fraction(numerator, denominator) for denominator, numerator in self.partials.items())
+
+    def _mean(self):
+        count = len(self.values)
+        if self.non_finite is not None:
+            return self.non_finite / count
+        return float(self._total() / count)
+
+    def _stdev(self):
+        """Sample standard deviation from the exact sums, (sum of squares - sum² / n) / (n - 1)."""
+        count = len(self.values)
+        total = self._total()
+        squares = sum(Fraction(numerator, denominator * denominator) for denominator, numerator in self.squares.items())
+        return math.sqrt((squares - total * total / count) / (count - 1))
+
+    def result(self, responses: int):
+        count = len(self.values)
+        # Ensure there's valid numeric data to average
+        if not count:
+            return "N/A (No valid numeric data)"
+        if self.non_finite is not None:
+            stdev = math.nan
+        else:
+            # The sample deviation needs two ratings
+            stdev = self._stdev() if count > 1 else 0.0
+        summary = {
+            RATING_MEAN: self._mean(),
+            RATING_MEDIAN: statistics.median(self.values),
+            RATING_STDEV: stdev,
+            RATING_COUNT: count,
+        }
+        summary.update((RATING_SCORE.format(score), self.histogram[score]) for score in RATING_SCORES)
+        summary[RATING_MISSING] = responses - count
+        return summary
+
+
+class _RemarksColumn:
+    """Free-text answers, listed as they are."""
+    __slots__ = ("items",)
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, value):
+        self.items.append(str(value).replace("\n", "")) # Ensure value is string
+
+    def result(self, responses: int):
+        return self.items
+
+
+class _YesNoColumn:
+    """Counts of the listed answers, other answers are not counted."""
+    __slots__ = ("counts",)
+
+    def __init__(self, answers=("Tak", "Nie wiem", "Nie")):
+        self.counts = dict.fromkeys(answers, 0)
+
+    def add(self, value):
+        value_str = str(value) # Ensure comparison with string
+        if value_str in self.counts:
+            self.counts[value_str] += 1
+
+    def result(self, responses: int):
+        return self.counts
+
+
+def _overlaps(first: str, second: str) -> bool:
+    """Whether `second` can start inside `first` and run past its end."""
+    return any(first.endswith(second[:k]) for k in range(1, min(len(first), len(second))))
+
+
+class _ChoiceMatcher:
+    """
+    Finds the options an answer contains, the same as testing `option in answer`
+    for every option. The options are compiled once into one regular expression,
+    longest first, so an answer is scanned once. A found option also brings in the
+    options it contains. If an option can start inside another and run past its end,
+    the scan could miss it, and the options are tested one by one instead.
+    """
+    __slots__ = ("options", "pattern", "contained")
+
+    def __init__(self, options):
+        self.options = tuple(options)
+        # Indexes, so an option listed twice is counted twice
+        self.contained = {
+            option: tuple(i for i, other in enumerate(self.options) if other in option)
+            for option in self.options
+        }
+        if all(self.options) and not any(_overlaps(a, b) for a in self.options for b in self.options):
+            longest_first = sorted(set(self.options), key=len, reverse=True)
+            self.pattern = re.compile("|".join(map(re.escape, longest_first)))
+        else:
+            self.pattern = None
+
+    def match(self, answer: str) -> list[int]:
+        """Indexes of the options found in `answer`."""
+        if self.pattern is None:
+            return [i for i, option in enumerate(self.options) if option in answer]
+        found = set()
+        for option in self.pattern.finditer(answer):
+            found.update(self.contained[option.group()])
+        return sorted(found)
+
+
+class _MultiChoiceColumn:
+    """
+    Counts every listed option an answer mentions, answers that mention none go to
+    the `other` bucket ("inne"). Answers repeat, so each distinct one is matched once,
+    when the summary is made.
+    """
+    __slots__ = ("matcher", "other", "answers")
+
+    def __init__(self, matcher: _ChoiceMatcher, other: str = "inne"):
+        self.matcher = matcher
+        self.other = other
+        self.answers = Counter()
+
+    def add(self, value):
+        self.answers[str(value)] += 1 # Ensure value is string for 'in' check
+
+    def result(self, responses: int):
+        options = self.matcher.options
+        counts = dict.fromkeys(options, 0)
+        counts[self.other] = 0
+        for answer, count in self.answers.items():
+            found = self.matcher.match(answer)
+            for i in found:
+                counts[options[i]] += count
+            if not found:
+                counts[self.other] += count
+        return counts
+
+
+class _TextColumn:
+    """Frequency of every distinct answer."""
+    __slots__ = ("counts",)
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def add(self, value):
+        self.counts[str(value)] += 1 # Ensure all values are strings
+
+    def result(self, responses: int):
+        return {"type": "text", "counts": dict(self.counts)}
+
+
+# Aggregator of each column type a survey schema can name, "skip" leaves the column out
+_COLUMN_TYPES = {
+    "mean": _RatingColumn,
+    "remarks": _RemarksColumn,
+    "yes_no": _YesNoColumn,
+    "multi_choice": _MultiChoiceColumn,
+    "text": _TextColumn,
+    "skip": None,
+}
+# How a rule matches a header, every rule has exactly one of these keys
+_HEADER_MATCHES = ("header", "prefix", "contains", "regex")
+
+
+def _normalize_header(header: str) -> str:
+    """Headers are compared with runs of whitespace collapsed, form exports are not consistent in it."""
+    return " ".join(header.split())
+
+
+def _column_factory(rule: dict):
+    """Creates the aggregators of a column type, None for skipped columns."""
+    column_type = rule.get("type")
+    if column_type not in _COLUMN_TYPES:
+        raise ValueError(f"Unknown survey column type {column_type!r}, expected one of {', '.join(_COLUMN_TYPES)}.")
+    if column_type == "yes_no" and "answers" in rule:
+        return functools.partial(_YesNoColumn, tuple(rule["answers"]))
+    if column_type == "multi_choice":
+        # Built once per rule, the matcher is shared by every column it classifies
+        matcher = _ChoiceMatcher(rule.get("options", []))
+        return functools.partial(_MultiChoiceColumn, matcher, rule.get("other", "inne"))
+    return _COLUMN_TYPES[column_type]
+
+
+def _compile_rule(rule: dict) -> tuple[re.Pattern, Any]:
+    matches = [key for key in _HEADER_MATCHES if key in rule]
+    if len(matches) != 1:
+        raise ValueError(f"Survey schema rule needs exactly one of {', '.join(_HEADER_MATCHES)}: {rule}")
+    match = matches[0]
+    if match == "regex":
+        pattern = rule["regex"]
+    else:
+        text = re.escape(_normalize_header(rule[match]))
+        pattern = {"header": f"^{text}$", "prefix": f"^{text}", "contains": text}[match]
+    return re.compile(pattern), _column_factory(rule)
+
+
+class SurveySchema:
+    """
+    Which aggregator summarizes each column of a survey form, chosen by the first
+    rule whose pattern matches the column header. The rules are compiled once and
+    every header is classified once, so adding a value to a column is a list lookup.
+    See src/config/survey_schema.json for the format.
+    """
+
+    def __init__(self, rules: list[dict], default: str = "text"):
+        self.rules = [_compile_rule(rule) for rule in rules]
+        self.default = _column_factory({"type": default})
+        self.dispatch = {}
+
+    @classmethod
+    def from_dict(cls, config: dict) -> "SurveySchema":
+        return cls(config.get("columns", []), config.get("default", "text"))
+
+    def column_factory(self, header: str):
+        """The aggregator factory of a header, None when the column is skipped."""
+        try:
+            return self.dispatch[header]
+        except KeyError:
+            normalized = _normalize_header(header)
+            factory = next(
+                (factory for pattern, factory in self.rules if pattern.search(normalized)),
+                self.default,
+            )
+            self.dispatch[header] = factory
+            return factory
+
+
+@functools.lru_cache(maxsize=8)
+def _load_survey_schema(path: str, mtime: float) -> SurveySchema:
+    with open(path, "r", encoding="utf-8") as f:
+        return SurveySchema.from_dict(json.load(f))
+
+
+def load_survey_schema(path: str = settings.SURVEY_SCHEMA_PATH) -> SurveySchema:
+    """Loads a survey schema file, it is parsed again only after it changed."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError as e:
+        raise FileNotFoundError(f"Survey schema '{path}' not found, survey columns cannot be classified without it.") from e
+    return _load_survey_schema(path, mtime)
+
+
+def read_ma_file(file_path: str, schema: SurveySchema | None = None):
     """
     Reads a Google Forms ODS file and summarizes data:
-    - Averages numeric columns
+    - Mean, median, deviation and score counts of rating columns
     - Counts text/choice-column responses
+    The sheet is read in one pass, each column only keeps its running summary.
+    Columns are classified by `schema`, the default one when not given.
     """
+    if schema is None:
+        schema = load_survey_schema()
 
-    spreadsheet = ezodf.opendoc(file_path)
-
-    # Only one sheet expected
-    if len(spreadsheet.sheets) != 1:
-        raise ValueError("ODS file must contain exactly one sheet.")
-    sheet = spreadsheet.sheets[0]
+    # Only one sheet expected, iter_rows raises a ValueError otherwise
+    rows = iter_rows(file_path)
 
     # Extract header row (first row)
-    headers = [
-        str(sheet[0, c].value)
-        for c in range(sheet.ncols())
-        if sheet[0, c].value is not None
-    ]
-
-    # Collect columns (skip headers)
-    columns = {h: [] for h in headers}
-    for r in range(1, sheet.nrows()):
-        for c, header in enumerate(headers):
-            value = sheet[r, c].value
-            if value is not None:
-                columns[header].append(value)
-
-    # Analyze columns
-    summary = {}
-    for header, values in columns.items():
-        if header == "Sygnatura czasowa":
-            continue
-        elif header in keys_average:
-            numeric_values = []
-            for v in values:
-                try:
-                    numeric_values.append(float(v))
-                except (TypeError, ValueError):
-                    pass
-            # Ensure there's valid numeric data to average
-            if numeric_values:
-                summary[header] = mean(numeric_values)
-            else:
-                summary[header] = "N/A (No valid numeric data)"
-
-        elif header in key_lista:
-            new_items = []
-            for value in values:
-                new_items.append(str(value).replace("\n", "")) # Ensure value is string
-            summary[header] = new_items
-        elif header in key_tak_nie:
-            tak = 0
-            nie_wiem = 0
-            nie = 0
-            for value in values:
-                value_str = str(value) # Ensure comparison with string
-                if value_str == "Tak":
-                    tak += 1
-                elif value_str == "Nie wiem":
-                    nie_wiem += 1
-                elif value_str == "Nie":
-                    nie += 1
-
-            summary[header] = {"Tak":tak, "Nie wiem":nie_wiem, "Nie":nie}
-        elif header in key_sorting:
-            temp = {}
-            for item in multi_choice_key:
-                temp[item] = 0
-            temp["inne"] = 0
-            for value in values:
-                found = False
-                value_str = str(value) # Ensure value is string for 'in' check
-                for item in multi_choice_key:
-                    if item in value_str:
-                        temp[item] += 1
-                        found = True
-                if not found:
-                    temp["inne"] += 1
-            summary[header] = temp
-        else:
-            # Some strings -> count frequency
-            summary[header] = {
-                "type": "text",
-                "counts": dict(Counter(str(v) for v in values)), # Ensure all values are strings
-            }
+    headers = [str(value) for value in next(rows, []) if value is not None]
+
+    # Columns with the same header share one aggregator
+    aggregators = {}
+    for header in headers:
+        if header not in aggregators:
+            factory = schema.column_factory(header)
+            aggregators[header] = factory() if factory is not None else None
+    # The n-th header takes the values of the n-th column, even after an empty header cell
+    column_aggregators = [aggregators[header] for header in headers]
+
+    responses = 0
+    for row in rows:
+        responses += 1
+        for aggregator, value in zip(column_aggregators, row):
+            if value is not None and aggregator is not None:
+                aggregator.add(value)
 
-    return summary
+    columns_per_header = Counter(headers)
+    return {
+        header: aggregator.result(responses * columns_per_header[header])
+        for header, aggregator in aggregators.items()
+        if aggregator is not None
+    }
 
 def write_summary_to_file(summary_data: dict, output_file_path: str):
     """
@@ -152,7 +363,9 @@ def write_summary_to_file(summary_data: dict, output_file_path: str):
 
 # --- Main execution ---
 
-def parse_ankieta_ewaluacyjna(ods_path: str, output_path: str):
-    results = read_ma_file(ods_path)
+def parse_ankieta_ewaluacyjna(ods_path: str, output_path: str, schema_path: str | None = None) -> dict:
+    schema = load_survey_schema(schema_path) if schema_path else None
+    results = read_ma_file(ods_path, schema)
     output_file_name = output_path
     write_summary_to_file(results, output_file_name)
+    return results
@@ -1,11 +1,12 @@
 # src/data_conversion/ods_parser.py
 import re
+from collections.abc import Iterable
 from datetime import datetime
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
 
-import ezodf
-from ezodf import Table
 from src.config import settings
+from src.data_conversion.ods_reader import iter_rows
 
 current_year = datetime.now().year
 
@@ -20,31 +21,38 @@ convert_months = {
 }
 
 
-def fix_date(input_date: Any) -> str:
-    """Cleans and standardizes a date string from various formats."""
-    if not isinstance(input_date, str) or len(input_date) < 6:
-        print(f"Invalid date input (type or length): {input_date}")
-        return str(input_date)
+# The hyphen is last in the set, so it is not read as a range. In the raw string
+# "\\s" is a backslash and the letter s, not whitespace; existing records were
+# converted with exactly this set, so it stays as it is
+_DATE_DELIMITERS = re.compile(r"[\\.,_\\s/-]")
+
 
-    # --- THIS IS THE LINE TO CHANGE ---
-    # OLD: parts = re.split(r"[\\-.,_\\s/]", input_date)
-    # NEW: Move the hyphen to the end of the character set
-    parts = re.split(r"[\\.,_\\s/-]", input_date)
-    # --- END OF CHANGE ---
+class DateError(NamedTuple):
+    """A date fix_dates could not read: its position in the batch, the value and why."""
+    index: int
+    value: Any
+    reason: str
 
+
+@lru_cache(maxsize=settings.DATE_CACHE_SIZE)
+def _normalize_date(input_date: str) -> Tuple[str, Optional[str]]:
+    """
+    The normalized date, or the input unchanged and the reason it could not be read.
+    Memoized, the same birth dates come up again and again.
+    """
     # Filter out empty strings that can result from multiple delimiters
-    parts = [part for part in parts if part]
+    parts = [part for part in _DATE_DELIMITERS.split(input_date) if part]
 
     if len(parts) < 3:
-        print(f"Invalid date format (not enough parts): {parts}")
-        return str(input_date)
+        return input_date, f"Invalid date format (not enough parts): {parts}"
 
     day_str, month_str, year_str = parts[0], parts[1], parts[2]
 
     # Normalize month if it's a name
-    translated_month = month_str.lower().translate(polish_map)
-    if translated_month in convert_months:
-        month_str = convert_months[translated_month]
+    if not month_str.isdigit():
+        translated_month = month_str.lower().translate(polish_map)
+        if translated_month in convert_months:
+            month_str = convert_months[translated_month]
 
     try:
         day = int(day_str)
@@ -56,44 +64,77 @@ def fix_date(input_date: Any) -> str:
         if not (1900 < year < current_year + 2): # Allow next year
             raise ValueError("Year out of reasonable range")
 
-        return f"{day:02d}.{month:02d}.{year} r."
+        return f"{day:02d}.{month:02d}.{year} r.", None
     except (ValueError, TypeError) as e:
-        print(f"Error parsing date parts '{day_str}-{month_str}-{year_str}': {e}")
-        return str(input_date)
+        return input_date, f"Error parsing date parts '{day_str}-{month_str}-{year_str}': {e}"
+
+
+def _fix_date(input_date: Any) -> Tuple[str, Optional[str]]:
+    if not isinstance(input_date, str) or len(input_date) < 6:
+        return str(input_date), f"Invalid date input (type or length): {input_date}"
+    return _normalize_date(input_date)
+
+
+def fix_date(input_date: Any) -> str:
+    """
+    Cleans and standardizes a date string from various formats to "DD.MM.YYYY r.".
+    A value that cannot be read is returned as a string, see fix_dates for the reasons.
+    """
+    return _fix_date(input_date)[0]
+
+
+def fix_dates(input_dates: Iterable[Any]) -> Tuple[List[str], List[DateError]]:
+    """
+    fix_date for many values at once. Returns the results in the same order and
+    a DateError for every value that could not be read.
+    """
+    results, errors = [], []
+    for index, input_date in enumerate(input_dates):
+        result, reason = _fix_date(input_date)
+        results.append(result)
+        if reason is not None:
+            errors.append(DateError(index, input_date, reason))
+    return results, errors
+
+
+def _cell(row: List[Any], column: int) -> Any:
+    """Value of a cell, None past the last non-empty cell of the row."""
+    return row[column] if column < len(row) else None
 
 
 def read_ods_file(file_path: str) -> List[Dict[str, Any]]:
     """
     Reads an ODS file, extracts participant data, and handles duplicates.
     """
-    spreadsheet = ezodf.opendoc(file_path)
-    if len(spreadsheet.sheets) != 1:
-        raise ValueError("ODS file must contain exactly one sheet.")
-    sheet = spreadsheet.sheets[0]
-    if not isinstance(sheet, Table):
-        raise TypeError("The sheet is not a valid table.")
+    # The sheet count is checked at the end of the file, so read all rows before
+    # processing any (the trailing empty rows are never read)
+    rows = list(iter_rows(file_path))
 
-    raw_participant_list = []
-    for i in range(1, sheet.nrows()):
-        imie_nazwisko_raw = sheet[i, 1].value
-        if not imie_nazwisko_raw:
-            continue
+    participant_rows = [row for row in rows[1:] if _cell(row, 1)]
+    birth_dates, date_errors = fix_dates(_cell(row, 2) for row in participant_rows)
 
-        imie_nazwisko = str(imie_nazwisko_raw).strip()
-        miejsce_urodzenia_raw = sheet[i, 3].value
+    raw_participant_list = []
+    for row, data_urodzenia in zip(participant_rows, birth_dates):
+        imie_nazwisko = str(_cell(row, 1)).strip()
+        miejsce_urodzenia_raw = _cell(row, 3)
         miejsce_urodzenia = str(miejsce_urodzenia_raw).lower().capitalize()
 
         new_participant = {
             settings.KEY_IMIE_NAZWISKO: imie_nazwisko,
             settings.KEY_MIEJSCE_URODZENIA: miejsce_urodzenia,
-            settings.KEY_DATA_URODZENIA: fix_date(sheet[i, 2].value),
+            settings.KEY_DATA_URODZENIA: data_urodzenia,
             settings.KEY_SORTING_NAME: imie_nazwisko.lower(),
-            settings.KEY_EMAIL: sheet[i, 5].value or None,
+            settings.KEY_EMAIL: _cell(row, 5) or None,
             settings.KEY_UUID: None,
             settings.KEY_GENERATED_TIMESTAMP: None,
         }
         raw_participant_list.append(new_participant)
 
+    if date_errors:
+        print(f"Warning: {len(date_errors)} birth date(s) could not be read and were kept as they are:")
+        for error in date_errors:
+            print(f"  {raw_participant_list[error.index][settings.KEY_IMIE_NAZWISKO]}: {error.reason}")
+
     return _deduplicate_participants(raw_participant_list)
 
 
@@ -0,0 +1,172 @@
+# src/data_conversion/ods_reader.py
+"""
+Streaming reader for the first sheet of an ODS spreadsheet.
+content.xml is parsed with lxml iterparse one table row at a time and every row is
+freed once it has been read, instead of building the whole document like ezodf.
+Repeated rows and cells (table:number-rows-repeated, table:number-columns-repeated)
+are expanded only when something non-empty follows them, so the padding that
+spreadsheet exports put at the end of a sheet is never materialized.
+Cell values are the same as ezodf's Cell.value.
+"""
+import zipfile
+import zlib
+from collections.abc import Iterator
+from typing import Any
+
+from lxml import etree
+
+_OFFICE = "urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+_TABLE = "urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+_TEXT = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+
+_TABLE_TAG = f"{{{_TABLE}}}table"
+_ROW_TAG = f"{{{_TABLE}}}table-row"
+_CELL_TAGS = (f"{{{_TABLE}}}table-cell", f"{{{_TABLE}}}covered-table-cell")
+_ROWS_REPEATED = f"{{{_TABLE}}}number-rows-repeated"
+_COLUMNS_REPEATED = f"{{{_TABLE}}}number-columns-repeated"
+_VALUE_TYPE = f"{{{_OFFICE}}}value-type"
+
+# Value attribute per office:value-type, numeric ones are read as floats
+_VALUE_ATTRIBUTES = {
+    "float": f"{{{_OFFICE}}}value",
+    "percentage": f"{{{_OFFICE}}}value",
+    "currency": f"{{{_OFFICE}}}value",
+    "date": f"{{{_OFFICE}}}date-value",
+    "time": f"{{{_OFFICE}}}time-value",
+    "boolean": f"{{{_OFFICE}}}boolean-value",
+}
+_NUMERIC_TYPES = frozenset(("float", "percentage", "currency"))
+
+# Elements whose text is the text and tails of their children, as in ezodf's Span
+_PARAGRAPH_TAGS = frozenset((f"{{{_TEXT}}}p", f"{{{_TEXT}}}h"))
+_SPAN_TAGS = _PARAGRAPH_TAGS | {f"{{{_TEXT}}}span", f"{{{_TEXT}}}a"}
+_SPACES_TAG = f"{{{_TEXT}}}s"
+_SPACES_COUNT = f"{{{_TEXT}}}c"
+_WHITESPACE_TEXT = {
+    f"{{{_TEXT}}}tab": "\t",
+    f"{{{_TEXT}}}line-break": "\n",
+    f"{{{_TEXT}}}soft-page-break": "",
+}
+
+
+def _plaintext(element) -> str:
+    tag = element.tag
+    if tag in _SPAN_TAGS:
+        parts = [element.text]
+        for child in element:
+            parts.append(_plaintext(child))
+            parts.append(child.tail)
+        return "".join(filter(None, parts))
+    if tag == _SPACES_TAG:
+        count = element.get(_SPACES_COUNT)
+        return " " * (int(count) if count is not None else 1)
+    if tag in _WHITESPACE_TEXT:
+        return _WHITESPACE_TEXT[tag]
+    return element.text or ""
+
+
+def _cell_value(cell) -> Any:
+    """The value of a table cell: float, bool, str (text, date or time) or None when empty."""
+    value_type = cell.get(_VALUE_TYPE)
+    if value_type is None:
+        return None
+    if value_type == "string":
+        return "\n".join(_plaintext(child) for child in cell if child.tag in _PARAGRAPH_TAGS)
+    attribute = _VALUE_ATTRIBUTES.get(value_type)
+    value = cell.get(attribute) if attribute else None
+    if value is None:
+        return None
+    if value_type in _NUMERIC_TYPES:
+        return float(value)
+    if value_type == "boolean":
+        return value == "true"
+    return value
+
+
+def _row_values(row) -> list[Any]:
+    """Cell values of a row, without the empty cells at its end."""
+    values = []
+    empty_cells = 0
+    for cell in row:
+        if cell.tag not in _CELL_TAGS:
+            continue
+        repeat = int(cell.get(_COLUMNS_REPEATED, 1))
+        value = _cell_value(cell)
+        if value is None:
+            empty_cells += repeat
+            continue
+        if empty_cells:
+            values.extend([None] * empty_cells)
+            empty_cells = 0
+        values.extend([value] * repeat)
+    return values
+
+
+def _open_content(file_path: str):
+    if zipfile.is_zipfile(file_path):
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                return archive.open("content.xml")
+        except (zipfile.BadZipFile, KeyError) as e:
+            raise ValueError(f"Not a readable ODS file ({e}).") from e
+    # Flat XML spreadsheet (.fods)
+    return open(file_path, "rb")
+
+
+def iter_rows(file_path: str, single_sheet: bool = True) -> Iterator[list[Any]]:
+    """
+    Yields the rows of the first sheet as lists of cell values, see _cell_value.
+    Rows end at their last non-empty cell and the empty rows at the end of the sheet
+    are not yielded. With single_sheet the rest of the document is scanned as well and
+    a ValueError is raised (after the last row) unless it holds exactly one sheet.
+    A file that is not a readable spreadsheet raises a ValueError as well.
+    """
+    try:
+        yield from _iter_content_rows(file_path, single_sheet)
+    except (zipfile.BadZipFile, zlib.error, etree.XMLSyntaxError) as e:
+        raise ValueError(f"Not a readable ODS file ({e}).") from e
+
+
+def _iter_content_rows(file_path: str, single_sheet: bool) -> Iterator[list[Any]]:
+    with _open_content(file_path) as content:
+        # Depth of nested tables, rows of tables inside cells belong to their cell
+        depth = 0
+        sheets = 0
+        empty_rows = 0
+        for event, element in etree.iterparse(content, events=("start", "end"), tag=(_TABLE_TAG, _ROW_TAG)):
+            if element.tag == _TABLE_TAG:
+                if event == "start":
+                    depth += 1
+                    if depth == 1:
+                        sheets += 1
+                        if sheets > 1:
+                            break
+                    continue
+                depth -= 1
+                if depth == 0:
+                    element.clear()
+                    if not single_sheet:
+                        return
+                continue
+            if event != "end" or depth != 1 or sheets != 1:
+                continue
+
+            repeat = int(element.get(_ROWS_REPEATED, 1))
+            values = _row_values(element)
+            # The row has been read, drop it and the rows before it from the tree
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+            if not values:
+                empty_rows += repeat
+                continue
+            for _ in range(empty_rows):
+                yield []
+            empty_rows = 0
+            yield values
+            for _ in range(repeat - 1):
+                yield list(values)
+
+    if single_sheet and sheets != 1:
+        raise ValueError("ODS file must contain exactly one sheet.")
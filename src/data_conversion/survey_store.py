@@ -0,0 +1,253 @@
+# src/data_conversion/survey_store.py
+"""
+Analytics store of evaluation survey results across trainings.
+Every imported survey is one row of `surveys`, identified by the SHA-256 of its
+ODS file so a file is stored once, with its rating columns in `ratings` (counts,
+sum and score histogram per question) and its counted answers in `answers`.
+Trends are SQL aggregates over these tables, the ODS files are not read again.
+"""
+import glob
+import hashlib
+import math
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Any
+
+from src.config import settings
+from src.data_conversion.ankieta_ods import (
+    RATING_COUNT, RATING_MEAN, RATING_MISSING, RATING_SCORE, RATING_SCORES,
+    load_survey_schema, read_ma_file,
+)
+from src.project_managment.file_ops import load_json_data
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS surveys (
+    id INTEGER PRIMARY KEY,
+    file_hash TEXT NOT NULL UNIQUE,
+    source TEXT,
+    training_number TEXT,
+    training_name TEXT,
+    location TEXT,
+    instructor TEXT,
+    training_date TEXT,  -- YYYY-MM-DD, NULL when the training date could not be read
+    imported TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ratings (
+    survey_id INTEGER NOT NULL REFERENCES surveys(id) ON DELETE CASCADE,
+    question TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    missing INTEGER NOT NULL,
+    score_1 INTEGER NOT NULL,
+    score_2 INTEGER NOT NULL,
+    score_3 INTEGER NOT NULL,
+    score_4 INTEGER NOT NULL,
+    score_5 INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS answers (
+    survey_id INTEGER NOT NULL REFERENCES surveys(id) ON DELETE CASCADE,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS surveys_instructor ON surveys(instructor);
+CREATE INDEX IF NOT EXISTS surveys_training_date ON surveys(training_date);
+CREATE INDEX IF NOT EXISTS ratings_survey ON ratings(survey_id);
+CREATE INDEX IF NOT EXISTS answers_survey ON answers(survey_id);
+"""
+
+# What results can be grouped and filtered by, as SQL expressions
+GROUP_COLUMNS = {
+    "training": "s.training_number",
+    "training_name": "s.training_name",
+    "instructor": "s.instructor",
+    "location": "s.location",
+    "date": "s.training_date",
+    "month": "substr(s.training_date, 1, 7)",
+    "year": "substr(s.training_date, 1, 4)",
+    "question": "q.question",
+}
+
+_DATE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})")
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _iso_date(text: Any) -> str | None:
+    """The first DD.MM.YYYY date of a training date field as YYYY-MM-DD."""
+    match = _DATE.search(str(text or ""))
+    if not match:
+        return None
+    day, month, year = match.groups()
+    return f"{year}-{int(month):02d}-{int(day):02d}"
+
+
+def _conditions(filters: dict[str, Any]) -> tuple[str, list[Any]]:
+    for key in filters:
+        if key not in GROUP_COLUMNS:
+            raise ValueError(f"Cannot filter surveys by {key!r}, expected one of {', '.join(GROUP_COLUMNS)}.")
+    if not filters:
+        return "", []
+    where = " AND ".join(f"{GROUP_COLUMNS[key]} = ?" for key in filters)
+    return f"WHERE {where}", [str(value) for value in filters.values()]
+
+
+def _grouping(group_by: tuple[str, ...]) -> tuple[str, str]:
+    """The selected group columns and the GROUP BY / ORDER BY clause."""
+    for key in group_by:
+        if key not in GROUP_COLUMNS:
+            raise ValueError(f"Cannot group surveys by {key!r}, expected one of {', '.join(GROUP_COLUMNS)}.")
+    if not group_by:
+        return "", ""
+    select = "".join(f"{GROUP_COLUMNS[key]} AS {key}, " for key in group_by)
+    columns = ", ".join(group_by)
+    return select, f"GROUP BY {columns} ORDER BY {columns}"
+
+
+class SurveyStore:
+    """SQLite file with the results of all imported surveys, see the module docstring."""
+
+    def __init__(self, path: str = settings.SURVEY_STORE_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def contains(self, file_hash: str) -> bool:
+        row = self.connection.execute("SELECT 1 FROM surveys WHERE file_hash = ?", (file_hash,)).fetchone()
+        return row is not None
+
+    def add_survey(self, file_hash: str, summary: dict, training: dict | None = None, source: str | None = None) -> bool:
+        """
+        Stores the summary of a survey (see ankieta_ods.read_ma_file) with the training
+        it evaluates. Returns False when a file with this hash is already stored.
+        A survey stored from the same `source` path before is replaced, the archived
+        copy of a training's survey is overwritten when a newer export is imported.
+        """
+        training = training or {}
+        if source is not None:
+            source = os.path.abspath(source)
+        with self.connection:
+            if source is not None and not self.contains(file_hash):
+                self.connection.execute("DELETE FROM surveys WHERE source = ?", (source,))
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO surveys (file_hash, source, training_number, training_name,"
+                " location, instructor, training_date, imported) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    file_hash,
+                    source,
+                    training.get(settings.KEY_NUMER_SZKOLENIA),
+                    training.get(settings.KEY_NAZWA_SZKOLENIA),
+                    training.get(settings.KEY_MIEJSCE_SZKOLENIA),
+                    training.get(settings.KEY_PROWADZACY),
+                    _iso_date(training.get(settings.KEY_DATA_SZKOLENIA)),
+                    datetime.now().isoformat(timespec="seconds"),
+                ),
+            )
+            if not cursor.rowcount:
+                return False
+            survey_id = cursor.lastrowid
+
+            ratings, answers = [], []
+            for question, value in summary.items():
+                if isinstance(value, dict) and RATING_MEAN in value:
+                    if not math.isfinite(value[RATING_MEAN]):
+                        # Answers such as "inf" make the mean unusable for trends
+                        continue
+                    count = value[RATING_COUNT]
+                    scores = [value[RATING_SCORE.format(score)] for score in RATING_SCORES]
+                    ratings.append((survey_id, question, count, value[RATING_MEAN] * count, value[RATING_MISSING], *scores))
+                elif isinstance(value, dict):
+                    # Text columns hold their counts under "counts", the others are the counts
+                    counts = value["counts"] if value.get("type") == "text" else value
+                    answers.extend((survey_id, question, str(answer), count) for answer, count in counts.items())
+                elif isinstance(value, list):
+                    # Remarks, every one counted once
+                    answers.extend((survey_id, question, str(remark), 1) for remark in value)
+                # Rating columns without any rating ("N/A") add nothing
+
+            self.connection.executemany(
+                "INSERT INTO ratings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", ratings
+            )
+            self.connection.executemany("INSERT INTO answers VALUES (?, ?, ?, ?)", answers)
+        return True
+
+    def rating_summary(self, group_by: tuple[str, ...] = ("instructor",), **filters) -> list[dict[str, Any]]:
+        """
+        Mean rating and score counts per group, e.g. per instructor of one year:
+            store.rating_summary(("instructor",), year="2025")
+        Groups and filters are the keys of GROUP_COLUMNS.
+        """
+        select, grouping = _grouping(tuple(group_by))
+        where, parameters = _conditions(filters)
+        scores = "".join(f", SUM(q.score_{score}) AS score_{score}" for score in RATING_SCORES)
+        rows = self.connection.execute(
+            f"SELECT {select}COUNT(DISTINCT s.id) AS surveys, SUM(q.count) AS ratings,"
+            f" SUM(q.total) / NULLIF(SUM(q.count), 0) AS mean, SUM(q.missing) AS missing{scores}"
+            f" FROM ratings q JOIN surveys s ON s.id = q.survey_id {where} {grouping}",
+            parameters,
+        )
+        return [dict(row) for row in rows]
+
+    def answer_counts(self, group_by: tuple[str, ...] = ("question",), **filters) -> list[dict[str, Any]]:
+        """How often each answer was given per group, e.g. the training topics asked for per year."""
+        select, _ = _grouping(tuple(group_by))
+        columns = ", ".join((*group_by, "answer"))
+        where, parameters = _conditions(filters)
+        rows = self.connection.execute(
+            f"SELECT {select}q.answer AS answer, COUNT(DISTINCT s.id) AS surveys, SUM(q.count) AS count"
+            f" FROM answers q JOIN surveys s ON s.id = q.survey_id {where}"
+            f" GROUP BY {columns} ORDER BY {columns}",
+            parameters,
+        )
+        return [dict(row) for row in rows]
+
+
+def record_survey(store: SurveyStore, ods_path: str, training: dict | None = None, schema_path: str | None = None) -> bool:
+    """
+    Adds a survey file to the store unless a file with the same contents is already
+    there, in which case it is not read at all. Returns whether it was added.
+    """
+    digest = file_hash(ods_path)
+    if store.contains(digest):
+        return False
+    schema = load_survey_schema(schema_path) if schema_path else None
+    return store.add_survey(digest, read_ma_file(ods_path, schema), training, source=ods_path)
+
+
+def import_archives(store: SurveyStore, root: str = settings.DEFAULT_TRAINING_ROOT) -> int:
+    """
+    Adds the archived survey of every training directory under `root`, with the
+    training details from its data.json. Returns the number of surveys added.
+    """
+    pattern = os.path.join(glob.escape(root), "*", settings.ARCHIVE_SUBDIR, settings.ANKIETA_EWALUACYJNA_FILENAME)
+    added = 0
+    for ods_path in sorted(glob.glob(pattern)):
+        directory = os.path.dirname(os.path.dirname(ods_path))
+        data = load_json_data(os.path.join(directory, settings.DATA_FILENAME)) or {}
+        schema_path = os.path.join(directory, settings.SURVEY_SCHEMA_FILENAME)
+        try:
+            if record_survey(store, ods_path, data.get(settings.KEY_TRAINING), schema_path if os.path.isfile(schema_path) else None):
+                added += 1
+        except (ValueError, OSError) as e:
+            print(f"Could not import survey '{ods_path}': {e}")
+    return added
@@ -214,7 +214,7 @@ class MainWindow(QWidget):
         """Handles the main 'Generate All' action."""
         if not self._confirm_and_save_changes(): return
         try:
-            self.data = self.manager.run_generation(self.data, force=True)
+            self.data = self.manager.run_generation(self.data)
             self.data_compare = json.loads(json.dumps(self.data))
             self._refresh_ui()
             QMessageBox.information(self, "Success", "All documents generated successfully.")
@@ -0,0 +1,170 @@
+# src/pdf_generation/asset_cache.py
+"""
+Process-wide cache of the images and fonts used by the PDF documents.
+Each image is decoded and compressed into a PDF image XObject only once,
+every canvas then gets a cheap copy that shares the encoded stream.
+The parsed TrueType font is kept on disk, so it is not parsed on every start.
+"""
+import copy
+import hashlib
+import os
+import pickle
+from fnmatch import fnmatch
+from weakref import WeakKeyDictionary
+
+import PIL.Image
+import reportlab
+from reportlab import rl_config
+from reportlab.lib.utils import ImageReader, _digester
+from reportlab.pdfbase import pdfdoc
+from reportlab.pdfbase.ttfonts import TTEncoding, TTFont, TTFontFace
+from reportlab.pdfgen import canvas
+
+from src.config import settings
+from src.pdf_generation.recording import RecordingCanvas
+from src.pdf_generation.tracing import span
+
+
+class CachedImage:
+    """A decoded image together with its PDF-ready (compressed) XObject."""
+    __slots__ = ("name", "xobject")
+
+    def __init__(self, name: str, xobject: pdfdoc.PDFImageXObject):
+        self.name = name
+        self.xobject = xobject
+
+
+_IMAGE_CACHE: dict[str, CachedImage] = {}
+
+
+def load_image(image_path: str) -> CachedImage:
+    """Returns the cached image for `image_path`, decoding and encoding it on first use."""
+    image = _IMAGE_CACHE.get(image_path)
+    if image is None:
+        with span("load_image"):
+            reader = ImageReader(PIL.Image.open(image_path))
+            # Same signature Canvas.drawImage computes for an ImageReader without a mask,
+            # so the output stays byte-identical to plain drawImage calls.
+            name = _digester(reader.getRGBData() + b"None")
+            xobject = pdfdoc.PDFImageXObject(name, reader, mask=None)
+            xobject.name = name
+            image = CachedImage(name, xobject)
+        _IMAGE_CACHE[image_path] = image
+    return image
+
+
+def draw_image(
+    c: canvas.Canvas | RecordingCanvas,
+    image_path: str,
+    x: float,
+    y: float,
+    width: float,
+    height: float,
+):
+    """
+    Drop-in replacement for `c.drawImage(ImageReader(...), x, y, width, height)`.
+    Mirrors the registration done by Canvas.drawImage, but reuses the cached XObject
+    instead of hashing and compressing the pixel data again for every canvas.
+    """
+    if isinstance(c, RecordingCanvas):
+        c.record(draw_image, image_path, x, y, width, height)
+        return
+
+    image = load_image(image_path)
+    c._currentPageHasImages = 1
+
+    reg_name = c._doc.getXObjectName(image.name)
+    if reg_name not in c._doc.idToObject:
+        # The document marks registered objects, so each one gets its own shallow copy
+        xobject = copy.copy(image.xobject)
+        c._setXObjects(xobject)
+        c._doc.Reference(xobject, reg_name)
+        c._doc.addForm(image.name, xobject)
+
+    c.saveState()
+    c.translate(x, y)
+    c.scale(width, height)
+    c._code.append(f"/{reg_name} Do")
+    c.restoreState()
+    c._formsinuse.append(image.name)
+
+
+def clear_image_cache():
+    """Drops all cached images, e.g. after the asset files were replaced."""
+    _IMAGE_CACHE.clear()
+
+
+# --- Font cache ---
+
+# Face attributes ReportLab reads when measuring, embedding and subsetting the font
+_FACE_KEYS = frozenset((
+    "name", "unitsPerEm", "charWidths", "defaultWidth", "charToGlyph",
+    "ascent", "descent", "bbox", "flags", "italicAngle", "stemV", "capHeight",
+))
+
+def _font_cache_path(font_name: str, font_data: bytes) -> str:
+    # The parsed tables depend on both the font file and the ReportLab version
+    digest = hashlib.sha256(font_data).hexdigest()[:16]
+    return os.path.join(settings.FONT_CACHE_DIR, f"{font_name}-{digest}-rl{reportlab.Version}.pickle")
+
+
+def _font_from_face(font_name: str, face: TTFontFace) -> TTFont:
+    """Builds a TTFont around an already parsed face, mirroring TTFont.__init__."""
+    font = TTFont.__new__(TTFont)
+    font.fontName = font_name
+    font.face = face
+    font.encoding = TTEncoding()
+    font.state = WeakKeyDictionary()
+    font._asciiReadable = rl_config.ttfAsciiReadable
+    font.shapable = not any(fnmatch(font_name, pattern) for pattern in rl_config.unShapedFontGlob)
+    return font
+
+
+def _load_cached_face(cache_path: str) -> TTFontFace | None:
+    try:
+        with open(cache_path, "rb") as f:
+            state = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    # Any other pickle in the cache file is parsed again from the font
+    if not isinstance(state, dict) or not _FACE_KEYS <= state.keys():
+        return None
+    face = TTFontFace.__new__(TTFontFace)
+    face.__dict__.update(state)
+    # The only attribute that cannot be pickled: font units -> PDF units
+    if face.unitsPerEm == 1000:
+        face._pdfScale = lambda x: x
+    else:
+        scale = 1000 / face.unitsPerEm
+        face._pdfScale = lambda x: x * scale
+    return face
+
+
+def _store_cached_face(cache_path: str, face: TTFontFace):
+    state = {key: value for key, value in vars(face).items() if key != "_pdfScale"}
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write font cache {cache_path}: {e}")
+
+
+def load_font(font_name: str, font_path: str) -> TTFont:
+    """
+    Returns a TTFont for `font_path`, reusing the parsed metrics and glyph tables
+    stored in settings.FONT_CACHE_DIR. The cache entry is keyed by the font file hash.
+    """
+    with open(font_path, "rb") as f:
+        font_data = f.read()
+    cache_path = _font_cache_path(font_name, font_data)
+
+    face = _load_cached_face(cache_path)
+    if face is not None:
+        return _font_from_face(font_name, face)
+
+    font = TTFont(font_name, font_path)
+    _store_cached_face(cache_path, font.face)
+    return font
@@ -3,19 +3,21 @@
 A standalone module for generating all PDF documents for the training program.
 It contains all necessary helpers, styles, components, and generation logic.
 """
-import PIL.Image
 import os
+import hashlib
+import io
+import itertools
 import json
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, BinaryIO, Dict
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
 # from typing import List, Dict, Any, Callable
 
 
@@ -34,21 +36,31 @@ from reportlab.lib.utils import ImageReader
 # )
 
 from src.config import settings
-from src.pdf_generation.tables import my_table
+from src.pdf_generation.asset_cache import draw_image, load_font, load_image
+from src.pdf_generation import tracing
+from src.pdf_generation.recording import DryRunCanvas, RecordingCanvas
+from src.pdf_generation.tables import clear_layout_cache, my_table
+from src.pdf_generation.tracing import span
 
 # ==============================================================================
 # SECTION: UTILITIES (from former utils.py)
 # ==============================================================================
 
 def register_font():
-    """Registers the DejaVuSans font for use in ReportLab."""
+    """
+    Registers the DejaVuSans font for use in ReportLab.
+    Does nothing if the font is already registered in this process.
+    """
     font_path = settings.FONT_PATH
     font_name = settings.FONT_NAME
+    if font_name in pdfmetrics.getRegisteredFontNames():
+        return True
     if not os.path.exists(font_path):
         print(f"Error: Font file not found at {font_path}.")
         return False
 
-    pdfmetrics.registerFont(TTFont(font_name, font_path))
+    with span("register_font"):
+        pdfmetrics.registerFont(load_font(font_name, font_path))
     pdfmetrics.registerFontFamily(
         font_name,
         normal=font_name,
@@ -66,11 +78,20 @@ def register_font():
 def draw_dziennik(
     training: dict[str, Any],
     participants: list[dict[str, Any]],
-    output_path: str,
+    output_path: str | BinaryIO,
 ):
-
+    """Draws the logbook into `output_path`, a file path or a writable binary file object."""
     c = canvas.Canvas(output_path, pagesize=A4)
+    with span("dziennik.draw"):
+        _draw_dziennik_pages(c, training, participants)
+    with span("dziennik.save"):
+        c.save()
 
+def _draw_dziennik_pages(
+    c: canvas.Canvas,
+    training: dict[str, Any],
+    participants: list[dict[str, Any]],
+):
     page_width, top = A4; middle = page_width/2; left = 2.72*cm
     c.setFont(settings.FONT_NAME, 28)
     c.drawCentredString(middle, 18.3*cm, "Dziennik zajęć")
@@ -115,8 +136,9 @@ def draw_dziennik(
     c.drawString(left, 6.5*cm, f"Prowadzący: {training.get(settings.KEY_PROWADZACY, 'PLACEHOLDER')}")
     # Logo
     w, h = 6.2*cm, 2.5*cm; x = page_width - 0.8*cm - w; y = top - 0.8*cm - h
-    c.drawImage(
-        ImageReader(PIL.Image.open(settings.IMAGE_LOGO_PATH)),
+    draw_image(
+        c,
+        settings.IMAGE_LOGO_PATH,
         x,
         y,
         width=w,
@@ -171,20 +193,19 @@ def draw_dziennik(
     c.drawString(left, current_y, "Lista uczestników:")
     current_y -= 0.5*cm
 
-    uczestnicy_data:list[list[Any]] = [[
+    uczestnicy_data: Iterator[list[Any]] = itertools.chain([[
         "",
         "Imie i nazwisko",
         "Data urodzenia",
         "Miejsce urodzenia",
         "Placówka",
-    ]]
-    uczestnicy_data.extend([[
+    ]], ([
         i+1,
         p.get(settings.KEY_IMIE_NAZWISKO, "MISSING"),
         p.get(settings.KEY_DATA_URODZENIA, "MISSING"),
         p.get(settings.KEY_MIEJSCE_URODZENIA, "MISSING"),
         training.get(settings.KEY_MIEJSCE_SZKOLENIA, "PLACEHOLDER")
-    ] for i, p in enumerate(participants)])
+    ] for i, p in enumerate(participants)))
 
     my_table(
         c,
@@ -208,16 +229,16 @@ def draw_dziennik(
     c.drawString(left, current_y, "Wydane zaświadczenia:")
     current_y -= 0.5*cm
 
-    wydane_data:list[list[Any]] = [["", "Imie i Nazwisko", "Numer Zaswiadczenia"]]
-    wydane_data.extend(
-        [
+    wydane_data: Iterator[list[Any]] = itertools.chain(
+        [["", "Imie i Nazwisko", "Numer Zaswiadczenia"]],
+        (
             [
                 i + 1,
                 p.get(settings.KEY_IMIE_NAZWISKO, "PLACEHOLDER"),
                 f"{training.get(settings.KEY_NUMER_SZKOLENIA, 'PLACEHOLDER')}/{i + 1}",
             ]
             for i, p in enumerate(participants)
-        ]
+        ),
     )
 
     my_table(
@@ -311,37 +332,70 @@ def draw_dziennik(
     # c.drawString(left, 5*cm, f"Wieliczka, {datetime.now().strftime("%d.%m.%Y")}")
     c.drawString(left, 5*cm, f"Wieliczka, {training.get(settings.KEY_DATA_WYSTAWIENIA, "PLACEHOLDER")}")
 
-    c.save()
-
 def draw_certyfikat(
     training: dict[str, Any],
     participant: dict[str, Any],
-    output_path: str,
+    output_path: str | BinaryIO,
+    template: "CertificateTemplate | None" = None,
 ):
-    # imie_nazwisko = data.get(settings.KEY_IMIE_NAZWISKO, "")
-    # data_urodzenia = data.get(settings.KEY_DATA_URODZENIA, "")
+    """
+    Draws a two-page certificate for one participant into `output_path`,
+    a file path or a writable binary file object.
+    Pass a CertificateTemplate to reuse the training layout across many certificates.
+    """
+    if template is None:
+        template = CertificateTemplate(training)
+    c = canvas.Canvas(output_path, pagesize=A4)
+    with span("certyfikat.draw"):
+        template.draw(c, participant)
+    with span("certyfikat.save"):
+        c.save()
+
+def draw_certyfikaty(
+    training: dict[str, Any],
+    participants: list[dict[str, Any]],
+    output_path: str | BinaryIO,
+):
+    """
+    Draws the certificates of all participants into a single PDF, two pages each.
+    One canvas is shared, so the font subset, the images and the static layer are embedded once.
+    """
+    template = CertificateTemplate(training)
+    c = canvas.Canvas(output_path, pagesize=A4)
+    for i, participant in enumerate(participants):
+        if i:
+            c.showPage()
+        with span("certyfikat.draw"):
+            template.draw(c, participant)
+    with span("certyfikat.save"):
+        c.save()
+
+def _draw_certyfikat_front(
+    c: canvas.Canvas | RecordingCanvas,
+    training: dict[str, Any],
+):
+    """Draws everything on the first certificate page that does not depend on the participant."""
     # nazwa_szkolenia = data.get(settings.KEY_NAZWA_SZKOLENIA, "")
     # dzien_ukonczenia = data.get(settings.KEY_DATA_SZKOLENIA, "")
     # w_wymiarze = data.get(settings.KEY_CZAS_TRWANIA, "")
     # wydano = data.get("wydano", "")
-    c = canvas.Canvas(output_path, pagesize=A4)
-
     c.setFont(settings.FONT_NAME, 12)
-    c.drawImage(
-        ImageReader(PIL.Image.open(settings.IMAGE_LOGO_PATH)),
+    draw_image(
+        c,
+        settings.IMAGE_LOGO_PATH,
         1.5*cm,
         26*cm,
         width=6.2*cm,
         height=2.5*cm
     )
-    c.drawImage(
-        ImageReader(PIL.Image.open(settings.IMAGE_STAMP_PATH)),
+    draw_image(
+        c,
+        settings.IMAGE_STAMP_PATH,
         12.1*cm,
         26.4*cm,
         width=7.5*cm,
         height=2.2*cm
     )
-    c.drawString(1.2*cm, 23.1*cm, participant.get(settings.KEY_UUID, "PLACEHOLDER"))
     c.setStrokeColor(colors.HexColor("#7B9FF3"))
     c.setFillColor(colors.HexColor("#7B9FF3"))
     c.line(2.8*cm, 22.4*cm, 18.2*cm, 22.4*cm)
@@ -354,23 +408,6 @@ def draw_certyfikat(
     c.setStrokeColor(colors.black)
     c.drawCentredString(A4[0]/2, 18.9*cm, "Pan/i")
 
-    my_table(
-        c,
-        [[f"{participant.get(settings.KEY_IMIE_NAZWISKO, "PLACEHOLDER")}"]],
-        0,
-        18.4*cm,
-        None,
-        has_border=False,
-        center_table=True,
-        font_size=20,
-        margins=False,
-        padding=False,
-        align="center"
-    )
-
-
-    c.setFont(settings.FONT_NAME, 12)
-    c.drawCentredString(A4[0]/2, 16.6*cm, f"urodzony/a: {participant.get(settings.KEY_DATA_URODZENIA, "PLACEHOLDER")}, {participant.get(settings.KEY_MIEJSCE_URODZENIA, 'PLACEHOLDER')}")
     current_y = 15 * cm
     c.drawCentredString(A4[0] / 2, current_y, "ukończył/a szkolenie:")
 
@@ -416,15 +453,45 @@ def draw_certyfikat(
     current_y -= 0.8 * cm
     c.drawString(3 * cm, current_y, f"Wieliczka, {training.get(settings.KEY_DATA_WYSTAWIENIA, "PLACEHOLDER")} r.")
 
-    # PAGE 2
+def _draw_certyfikat_participant(
+    c: canvas.Canvas,
+    participant: dict[str, Any],
+):
+    """Draws the participant-specific text of the first certificate page."""
+    # imie_nazwisko = data.get(settings.KEY_IMIE_NAZWISKO, "")
+    # data_urodzenia = data.get(settings.KEY_DATA_URODZENIA, "")
+    c.setFont(settings.FONT_NAME, 12)
+    c.drawString(1.2*cm, 23.1*cm, participant.get(settings.KEY_UUID, "PLACEHOLDER"))
+
+    my_table(
+        c,
+        [[f"{participant.get(settings.KEY_IMIE_NAZWISKO, "PLACEHOLDER")}"]],
+        0,
+        18.4*cm,
+        None,
+        has_border=False,
+        center_table=True,
+        font_size=20,
+        margins=False,
+        padding=False,
+        align="center"
+    )
+
+    c.setFont(settings.FONT_NAME, 12)
+    c.drawCentredString(A4[0]/2, 16.6*cm, f"urodzony/a: {participant.get(settings.KEY_DATA_URODZENIA, "PLACEHOLDER")}, {participant.get(settings.KEY_MIEJSCE_URODZENIA, 'PLACEHOLDER')}")
+
+def _draw_certyfikat_plan(
+    c: canvas.Canvas | RecordingCanvas,
+    training: dict[str, Any],
+):
+    """Draws the second certificate page (the training plan)."""
     left = 2.72*cm
-    c.showPage()
     current_y = A4[1]-3*cm
     c.setFont(settings.FONT_NAME, 12)
     c.drawString(left, current_y, "Plan szkolenia:")
     current_y -= 0.5*cm
 
-    current_y = my_table(
+    my_table(
         c,
         [
             [
@@ -440,50 +507,415 @@ def draw_certyfikat(
         center_table=True,
     )
 
-    c.save()
+# ==============================================================================
+# SECTION: CERTIFICATE TEMPLATE
+# ==============================================================================
+
+class CertificateTemplate:
+    """
+    The part of a certificate that is the same for every participant of a training.
+
+    The static layer (images, rules, headings, training details and the whole
+    "Plan szkolenia" page) is laid out once into recorded drawing operations.
+    On each canvas it is stored as a form XObject the first time it is needed and
+    then referenced, so a certificate only costs placing the participant's text.
+    """
+
+    def __init__(self, training: dict[str, Any]):
+        with span("certyfikat.template"):
+            self.front = RecordingCanvas()
+            _draw_certyfikat_front(self.front, training)
+            self.plan = RecordingCanvas()
+            _draw_certyfikat_plan(self.plan, training)
+        # Derived from the content, so every process names the same template the same way
+        form_id = _inputs_hash(
+            CERTIFICATE_TEMPLATE_VERSION,
+            [training.get(key) for key in _CERTIFICATE_TRAINING_KEYS],
+        )[:12]
+        self.front_form = f"CertyfikatFront{form_id}"
+        self.plan_form = f"CertyfikatPlan{form_id}"
+
+    def draw(self, c: canvas.Canvas, participant: dict[str, Any]):
+        """Draws both certificate pages for `participant` onto `c`."""
+        self._draw_layer(c, self.front, self.front_form)
+        _draw_certyfikat_participant(c, participant)
+        c.showPage()
+        self._draw_layer(c, self.plan, self.plan_form)
+
+    @staticmethod
+    def _draw_layer(c: canvas.Canvas, layer: RecordingCanvas, form_name: str):
+        if layer.breaks_page:
+            # A form is a single page, overflowing tables are drawn directly
+            layer.replay(c)
+            return
+        if not c.hasForm(form_name):
+            c.beginForm(form_name)
+            layer.replay(c)
+            c.endForm()
+        c.doForm(form_name)
 
 # ==============================================================================
 # SECTION: INTERNAL GENERATION LOGIC
 # ==============================================================================
 
-def _generate_all_certificates(data_json, output_dir, force):
+# Bump when a change in the drawing code should regenerate every existing document
+CERTIFICATE_TEMPLATE_VERSION = 1
+LOGBOOK_TEMPLATE_VERSION = 1
+
+_CERTIFICATE_TRAINING_KEYS = (
+    settings.KEY_NAZWA_SZKOLENIA,
+    settings.KEY_DATA_SZKOLENIA,
+    settings.KEY_CZAS_TRWANIA,
+    settings.KEY_DATA_WYSTAWIENIA,
+    settings.KEY_TEMATYKA,
+)
+_CERTIFICATE_PARTICIPANT_KEYS = (
+    settings.KEY_UUID,
+    settings.KEY_IMIE_NAZWISKO,
+    settings.KEY_DATA_URODZENIA,
+    settings.KEY_MIEJSCE_URODZENIA,
+)
+_LOGBOOK_TRAINING_KEYS = (*settings.TRAINING_FIELDS, settings.KEY_TEMATYKA)
+_LOGBOOK_PARTICIPANT_KEYS = (
+    settings.KEY_IMIE_NAZWISKO,
+    settings.KEY_DATA_URODZENIA,
+    settings.KEY_MIEJSCE_URODZENIA,
+)
+
+def _inputs_hash(*parts: Any) -> str:
+    payload = json.dumps(parts, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _certificate_hash(training: dict[str, Any], participant: dict[str, Any]) -> str:
+    return _inputs_hash(
+        CERTIFICATE_TEMPLATE_VERSION,
+        [training.get(key) for key in _CERTIFICATE_TRAINING_KEYS],
+        [participant.get(key) for key in _CERTIFICATE_PARTICIPANT_KEYS],
+    )
+
+def _logbook_hash(training: dict[str, Any], participants: list[dict[str, Any]]) -> str:
+    return _inputs_hash(
+        LOGBOOK_TEMPLATE_VERSION,
+        [training.get(key) for key in _LOGBOOK_TRAINING_KEYS],
+        [[p.get(key) for key in _LOGBOOK_PARTICIPANT_KEYS] for p in participants],
+    )
+
+def _is_up_to_date(record: dict[str, Any], inputs_hash: str, output_path: str, force: bool) -> bool:
+    """True if `output_path` was generated from exactly these inputs and still exists."""
+    return (
+        not force
+        and record.get(settings.KEY_GENERATED_HASH) == inputs_hash
+        and os.path.exists(output_path)
+    )
+
+def _mark_generated(record: dict[str, Any], inputs_hash: str):
+    record[settings.KEY_GENERATED_HASH] = inputs_hash
+    record[settings.KEY_GENERATED_TIMESTAMP] = datetime.now().isoformat(timespec="seconds")
+
+def _document_record(data_json: dict[str, Any], filename: str) -> dict[str, Any]:
+    """Generation record of a document that is not tied to a single participant."""
+    return data_json.setdefault(settings.KEY_DOCUMENTS, {}).setdefault(filename, {})
+
+def _assign_uuids(training: dict[str, Any], participants: list[dict[str, Any]]):
+    for i, person in enumerate(participants):
+        person[settings.KEY_UUID] = f"{training.get(settings.KEY_NUMER_SZKOLENIA)}/{i+1}"
+
+_worker_template: CertificateTemplate | None = None
+
+def _init_certificate_worker(training: dict[str, Any]):
+    """
+    Process pool initializer: registers the font, loads the images and
+    builds the certificate template once per worker.
+    """
+    global _worker_template
+    register_font()
+    load_image(settings.IMAGE_LOGO_PATH)
+    load_image(settings.IMAGE_STAMP_PATH)
+    _worker_template = CertificateTemplate(training)
+
+def _draw_certyfikat_job(job: tuple[dict[str, Any], str]) -> str:
+    person, file_path = job
+    draw_certyfikat({}, person, file_path, template=_worker_template)
+    return file_path
+
+def _render_certyfikat_job(person: dict[str, Any]) -> bytes:
+    return render_certyfikat({}, person, template=_worker_template)
+
+def _resolve_workers(workers: int | None, job_count: int) -> int:
+    if workers is None or workers < 1:
+        workers = os.cpu_count() or 1
+    return min(workers, job_count)
+
+def _chunksize(job_count: int, workers: int) -> int:
+    # Hand out contiguous chunks so every worker pays its startup cost only once.
+    return max(1, job_count // (workers * 4))
+
+def _generate_all_certificates(data_json, output_dir, force, workers=1):
     participants = data_json.get(settings.KEY_PARTICIPANTS, [])
     training = data_json.get(settings.KEY_TRAINING, {})
+    _assign_uuids(training, participants)
 
+    jobs, hashes = [], []
     for i, person in enumerate(participants):
-        person[settings.KEY_UUID] = f"{training.get(settings.KEY_NUMER_SZKOLENIA)}/{i+1}"
         file_path = os.path.join(output_dir, f"certyfikat_{i+1}.pdf")
-        draw_certyfikat(training, person, file_path)
-        print("-> created:", file_path)
+        inputs_hash = _certificate_hash(training, person)
+        if _is_up_to_date(person, inputs_hash, file_path, force):
+            continue
+        jobs.append((person, file_path))
+        hashes.append(inputs_hash)
+
+    skipped = len(participants) - len(jobs)
+    if skipped:
+        print(f"-> {skipped} certificates up to date, skipped")
+
+    workers = _resolve_workers(workers, len(jobs))
+    if workers <= 1:
+        if not jobs:
+            return
+        template = CertificateTemplate(training)
+        for (person, file_path), inputs_hash in zip(jobs, hashes):
+            draw_certyfikat(training, person, file_path, template=template)
+            _mark_generated(person, inputs_hash)
+            print("-> created:", file_path)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_certificate_worker,
+        initargs=(training,),
+    ) as pool:
+        results = pool.map(_draw_certyfikat_job, jobs, chunksize=_chunksize(len(jobs), workers))
+        for (person, _), inputs_hash, file_path in zip(jobs, hashes, results):
+            _mark_generated(person, inputs_hash)
+            print("-> created:", file_path)
+
+def _generate_certificates_file(data_json, output_path, force):
+    participants = data_json.get(settings.KEY_PARTICIPANTS, [])
+    training = data_json.get(settings.KEY_TRAINING, {})
+    _assign_uuids(training, participants)
+
+    record = _document_record(data_json, os.path.basename(output_path))
+    hashes = [_certificate_hash(training, person) for person in participants]
+    inputs_hash = _inputs_hash(hashes)
+    if _is_up_to_date(record, inputs_hash, output_path, force):
+        print("-> up to date:", output_path)
+        return
 
-def _generate_logbook(data_json, output_path):
+    draw_certyfikaty(training, participants, output_path)
+    _mark_generated(record, inputs_hash)
+    print("-> created:", output_path)
+
+def _generate_logbook(data_json, output_path, force):
     participants = data_json.get(settings.KEY_PARTICIPANTS, [])
     training = data_json.get(settings.KEY_TRAINING, {})
+
+    record = _document_record(data_json, os.path.basename(output_path))
+    inputs_hash = _logbook_hash(training, participants)
+    if _is_up_to_date(record, inputs_hash, output_path, force):
+        print("-> up to date:", output_path)
+        return
+
     draw_dziennik(training, participants, output_path)
+    _mark_generated(record, inputs_hash)
     print("-> created:", output_path)
 
 
+# ==============================================================================
+# SECTION: ESTIMATION
+# ==============================================================================
+
+# Approximate PDF sizes in bytes, fitted on generated documents with the bundled font and images,
+# with short and long (page-breaking) training topics. The fixed part is mostly the embedded
+# font subset and the images. Text is counted by its compressed size, see DryRunCanvas.text_size.
+_LOGBOOK_BASE_SIZE = 42_400
+_LOGBOOK_SIZE_PER_PAGE = 1_379
+_LOGBOOK_SIZE_PER_TEXT_BYTE = 1.36
+_CERTIFICATE_BASE_SIZE = 92_300
+_CERTIFICATE_SIZE_PER_PAGE = 556
+_CERTIFICATE_SIZE_PER_TEXT_BYTE = 1.33
+_CERTIFICATE_SIZE_PER_FORM = 520
+
+def _estimate_dziennik(training: dict[str, Any], participants: list[dict[str, Any]]) -> dict[str, int]:
+    c = DryRunCanvas()
+    _draw_dziennik_pages(c, training, participants)
+    return {
+        "files": 1,
+        "pages": c.pages,
+        "size": round(
+            _LOGBOOK_BASE_SIZE
+            + _LOGBOOK_SIZE_PER_PAGE * c.pages
+            + _LOGBOOK_SIZE_PER_TEXT_BYTE * c.text_size
+        ),
+    }
+
+def _estimate_certyfikaty(
+    training: dict[str, Any],
+    participants: list[dict[str, Any]],
+    single_file: bool,
+) -> dict[str, int]:
+    # The static layers are the same for every participant, so they are laid out once
+    front = DryRunCanvas()
+    _draw_certyfikat_front(front, training)
+    plan = DryRunCanvas()
+    _draw_certyfikat_plan(plan, training)
+
+    pages = 0
+    text_size = 0
+    for i, person in enumerate(participants):
+        c = DryRunCanvas()
+        uuid = f"{training.get(settings.KEY_NUMER_SZKOLENIA)}/{i+1}"
+        _draw_certyfikat_participant(c, {**person, settings.KEY_UUID: uuid})
+        # The participant's text continues the last front page, the plan starts a new one
+        pages += front.pages + c.pages - 1 + plan.pages
+        text_size += c.text_size
+
+    files = min(1, len(participants)) if single_file else len(participants)
+    size = files * _CERTIFICATE_BASE_SIZE + pages * _CERTIFICATE_SIZE_PER_PAGE
+    for layer in (front, plan):
+        if layer.pages > 1:
+            # Replayed for every participant, see CertificateTemplate._draw_layer
+            copies = len(participants)
+        else:
+            # A form, stored once per file
+            copies = files
+            size += files * _CERTIFICATE_SIZE_PER_FORM
+        text_size += copies * layer.text_size
+    size += text_size * _CERTIFICATE_SIZE_PER_TEXT_BYTE
+    return {
+        "files": files,
+        "pages": pages,
+        "size": round(size),
+    }
+
+
 # ==============================================================================
 # SECTION: PUBLIC API
 # ==============================================================================
 
-def generate(data_json: Dict[str, Any], output_dir: str, **kwargs):
+def generate(data_json: Dict[str, Any], output_dir: str, **kwargs) -> Dict[str, Any]:
     """
     Main PDF generation orchestrator.
     Generates a logbook and all required certificates.
+
+    Generation is incremental: the inputs of every document are hashed and the
+    hash is stored in data_json together with a timestamp. Documents whose hash
+    did not change since the last run (and whose file still exists) are skipped.
+    Returns data_json with the updated generation records.
+
+    Keyword Args:
+        force: Regenerate all documents even if they are up to date.
+        workers: Number of processes used to render certificates.
+                 1 (default) renders serially, 0 or None uses every CPU core.
+        single_file: Write all certificates into one multi-page PDF
+                     (settings.CERTIFICATES_FILENAME) instead of one file each.
+        trace_path: Record timing spans for this run and write the report
+                    (count, total, p50, p95 per stage) to this JSON file.
     """
     force = kwargs.get('force', False)
-    register_font()
+    workers = kwargs.get('workers', 1)
+    single_file = kwargs.get('single_file', False)
+    trace_path = kwargs.get('trace_path')
+
+    if trace_path:
+        with tracing.collect() as trace_report:
+            _generate(data_json, output_dir, force, workers, single_file)
+        tracing.dump_json(trace_path, trace_report)
+        print("-> trace written:", trace_path)
+    else:
+        _generate(data_json, output_dir, force, workers, single_file)
+    return data_json
+
+def _generate(data_json, output_dir, force, workers, single_file):
+    with span("generate"):
+        register_font()
+        # Layouts are shared by all documents of this run; see tables.layout_cache_info()
+        clear_layout_cache()
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        # 1. Generate Certificates
+        print("Generating certificates...")
+        with span("generate.certificates"):
+            if single_file:
+                certs_path = os.path.join(output_dir, settings.CERTIFICATES_FILENAME)
+                _generate_certificates_file(data_json, certs_path, force)
+            else:
+                certs_dir = os.path.join(output_dir, settings.CERTIFICATES_DIR_NAME)
+                os.makedirs(certs_dir, exist_ok=True)
+                _generate_all_certificates(data_json, certs_dir, force, workers)
+
+        # 2. Generate Logbook
+        print("Generating logbook...")
+        with span("generate.logbook"):
+            logbook_path = os.path.join(output_dir, settings.LOGBOOK_FILENAME)
+            _generate_logbook(data_json, logbook_path, force)
+
+def estimate(data_json: Dict[str, Any], **kwargs) -> Dict[str, Dict[str, int]]:
+    """
+    Estimates what generate() would write, without rendering anything.
+    Only the table layouts of the logbook and the certificates run: there is no
+    canvas, no image is loaded and no font is embedded. data_json is not modified.
 
-    os.makedirs(output_dir, exist_ok=True)
+    Returns {name: {"files": ..., "pages": ..., "size": ...}} for the logbook
+    and the certificates, where size is the approximate total in bytes.
 
-    # 1. Generate Certificates
-    print("Generating certificates...")
-    certs_dir = os.path.join(output_dir, settings.CERTIFICATES_DIR_NAME)
-    os.makedirs(certs_dir, exist_ok=True)
-    _generate_all_certificates(data_json, certs_dir, force)
+    Keyword Args:
+        single_file: Estimate the certificates as one multi-page PDF, as generate(single_file=True) writes them.
+    """
+    single_file = kwargs.get('single_file', False)
+    participants = data_json.get(settings.KEY_PARTICIPANTS, [])
+    training = data_json.get(settings.KEY_TRAINING, {})
+
+    with span("estimate"):
+        register_font()
+        certificates_name = settings.CERTIFICATES_FILENAME if single_file else settings.CERTIFICATES_DIR_NAME
+        return {
+            settings.LOGBOOK_FILENAME: _estimate_dziennik(training, participants),
+            certificates_name: _estimate_certyfikaty(training, participants, single_file),
+        }
 
-    # 2. Generate Logbook
-    print("Generating logbook...")
-    logbook_path = os.path.join(output_dir, settings.LOGBOOK_FILENAME)
-    _generate_logbook(data_json, logbook_path)
+def render_certyfikat(
+    training: dict[str, Any],
+    participant: dict[str, Any],
+    template: CertificateTemplate | None = None,
+) -> bytes:
+    """Renders one certificate in memory and returns the PDF bytes."""
+    buffer = io.BytesIO()
+    draw_certyfikat(training, participant, buffer, template=template)
+    return buffer.getvalue()
+
+def render_dziennik(
+    training: dict[str, Any],
+    participants: list[dict[str, Any]],
+) -> bytes:
+    """Renders the logbook in memory and returns the PDF bytes."""
+    buffer = io.BytesIO()
+    draw_dziennik(training, participants, buffer)
+    return buffer.getvalue()
+
+def iter_certificates(data_json: Dict[str, Any], workers: int | None = 1) -> Iterator[tuple[int, bytes]]:
+    """
+    Renders all certificates without touching the filesystem.
+    Yields (participant_index, pdf_bytes) in participant order as each certificate is finished,
+    so the results can be streamed into a ZIP, a socket or a mail queue.
+    UUIDs are assigned exactly like in generate(); `workers` works the same way too.
+    """
+    register_font()
+    participants = data_json.get(settings.KEY_PARTICIPANTS, [])
+    training = data_json.get(settings.KEY_TRAINING, {})
+    _assign_uuids(training, participants)
+
+    workers = _resolve_workers(workers, len(participants))
+    if workers <= 1:
+        template = CertificateTemplate(training)
+        for i, person in enumerate(participants):
+            yield i, render_certyfikat(training, person, template=template)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_certificate_worker,
+        initargs=(training,),
+    ) as pool:
+        chunksize = _chunksize(len(participants), workers)
+        yield from enumerate(pool.map(_render_certyfikat_job, participants, chunksize=chunksize))
@@ -0,0 +1,88 @@
+# src/pdf_generation/metrics.py
+"""
+String width measurement for the table layout.
+For TrueType fonts (DejaVuSans) the advance widths of Latin-1 and Latin Extended-A,
+which holds the Polish diacritics, are copied into a flat tuple indexed by codepoint,
+so measuring a string is a sum of table lookups. Other characters fall back to the
+font's own width map, other fonts to pdfmetrics.stringWidth.
+The results are identical to pdfmetrics.stringWidth.
+"""
+from collections.abc import Iterable
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+ADVANCE_TABLE_SIZE = 0x180  # U+0000..U+017F
+
+
+class AdvanceTable:
+    """Advance widths (in font units) of one TrueType font, indexed by codepoint."""
+    __slots__ = ("widths", "char_widths", "default_width")
+
+    def __init__(self, font: TTFont):
+        self.char_widths = font.face.charWidths
+        self.default_width = font.face.defaultWidth
+        # A tuple rather than array("d"): indexing an array boxes a new float on every lookup
+        self.widths = tuple(
+            self.char_widths.get(codepoint, self.default_width)
+            for codepoint in range(ADVANCE_TABLE_SIZE)
+        )
+
+    def raw_width(self, text: str) -> float:
+        """Width of `text` in font units (1/1000 of the font size)."""
+        try:
+            return sum(map(self.widths.__getitem__, map(ord, text)))
+        except IndexError:
+            # Slow path for characters outside the table
+            widths, get, default_width = self.widths, self.char_widths.get, self.default_width
+            return sum(
+                widths[codepoint] if codepoint < ADVANCE_TABLE_SIZE else get(codepoint, default_width)
+                for codepoint in map(ord, text)
+            )
+
+
+_ADVANCE_TABLES: dict[str, AdvanceTable | None] = {}
+
+
+def _advance_table(font_name: str) -> AdvanceTable | None:
+    try:
+        return _ADVANCE_TABLES[font_name]
+    except KeyError:
+        font = pdfmetrics.getFont(font_name)
+        table = AdvanceTable(font) if isinstance(font, TTFont) else None
+        _ADVANCE_TABLES[font_name] = table
+        return table
+
+
+def string_width(text: str, font_name: str, font_size: float) -> float:
+    """Drop-in replacement for pdfmetrics.stringWidth."""
+    table = _advance_table(font_name)
+    if table is None:
+        return pdfmetrics.stringWidth(text, font_name, font_size)
+    # Same operation order as reportlab, so the float result is the same
+    return 0.001 * font_size * table.raw_width(text)
+
+
+def string_widths(texts: Iterable[str], font_name: str, font_size: float) -> list[float]:
+    """
+    Measures many strings at once, e.g. all words of a paragraph.
+    The font is looked up once and every distinct string is measured once.
+    """
+    table = _advance_table(font_name)
+    measured: dict[str, float] = {}
+    result = []
+    for text in texts:
+        width = measured.get(text)
+        if width is None:
+            if table is None:
+                width = pdfmetrics.stringWidth(text, font_name, font_size)
+            else:
+                width = 0.001 * font_size * table.raw_width(text)
+            measured[text] = width
+        result.append(width)
+    return result
+
+
+def clear_advance_tables():
+    """Forgets the advance tables, e.g. after a font was registered again under the same name."""
+    _ADVANCE_TABLES.clear()
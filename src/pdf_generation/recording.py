@@ -0,0 +1,95 @@
+# src/pdf_generation/recording.py
+"""
+A stand-in canvas that records drawing calls so they can be replayed later.
+Used to lay out the static parts of a document once and reuse them on many canvases.
+"""
+import zlib
+from collections.abc import Iterable
+from typing import Any, Callable
+
+from reportlab.pdfgen import canvas
+
+
+class RecordingCanvas:
+    """
+    Records every Canvas method called on it as a (function, args, kwargs) operation.
+    Helpers that are not Canvas methods (e.g. asset_cache.draw_image) record themselves via `record`.
+    """
+
+    def __init__(self):
+        self.ops: list[tuple[Callable[..., Any], tuple, dict[str, Any]]] = []
+
+    def __getattr__(self, name: str):
+        method = getattr(canvas.Canvas, name)
+
+        def _record(*args, **kwargs):
+            self.ops.append((method, args, kwargs))
+
+        return _record
+
+    def record(self, function: Callable[..., Any], *args, **kwargs):
+        """Records a call of `function(c, *args, **kwargs)`."""
+        self.ops.append((function, args, kwargs))
+
+    @property
+    def breaks_page(self) -> bool:
+        """True if the recorded operations start a new page (e.g. an overflowing table)."""
+        return any(function is canvas.Canvas.showPage for function, _, _ in self.ops)
+
+    def replay(self, c: canvas.Canvas):
+        """Performs all recorded operations on a real canvas."""
+        for function, args, kwargs in self.ops:
+            function(c, *args, **kwargs)
+
+
+def _ignore(*args, **kwargs):
+    pass
+
+
+class DryRunCanvas(RecordingCanvas):
+    """
+    Accepts the same drawing calls but draws and records nothing. It only counts
+    what a size estimate needs: pages, text operations and drawn characters.
+    The text also goes through a zlib stream per page like the page content does,
+    so text_size tells how much it adds to a PDF once compressed.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.pages = 1
+        self.text_ops = 0
+        self.text_chars = 0
+        self.other_ops = 0
+        self._compressor = zlib.compressobj()
+        self._compressed = 0
+
+    @property
+    def text_size(self) -> int:
+        """Compressed size of the text drawn so far, in bytes."""
+        return self._compressed + len(self._compressor.copy().flush())
+
+    def __getattr__(self, name: str):
+        self.other_ops += 1
+        return _ignore
+
+    def record(self, function: Callable[..., Any], *args, **kwargs):
+        self.other_ops += 1
+
+    def showPage(self):
+        self.pages += 1
+        # Every page is a content stream of its own
+        self._compressed += len(self._compressor.flush())
+        self._compressor = zlib.compressobj()
+
+    def drawString(self, x: float, y: float, text: str, *args, **kwargs):
+        self.text_ops += 1
+        self.text_chars += len(text)
+        self._compressed += len(self._compressor.compress(text.encode("utf-8")))
+
+    drawCentredString = drawString
+    drawRightString = drawString
+
+    def count_text(self, lines: Iterable[str]):
+        """Counts lines a helper draws in its own text object (e.g. a table row) like drawString calls."""
+        for line in lines:
+            self.drawString(0, 0, line)
@@ -1,58 +1,103 @@
+import itertools
+from array import array
+from functools import lru_cache
+from collections.abc import Iterable, Iterator, Sequence
 from typing import Any
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import cm, mm
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
 from src.config import settings
+from src.pdf_generation.metrics import string_width, string_widths
+from src.pdf_generation.recording import DryRunCanvas, RecordingCanvas
+from src.pdf_generation.tracing import span
 
 
 def _split_text_for_cell(
     text, available_width_for_text, font_name, font_size
 ) -> list[str]:
     """Helper function to wrap text into lines for a given width."""
+    return list(_wrap_cell(text, available_width_for_text, font_name, font_size)[0])
+
+def _wrap_cell(text, available_width_for_text, font_name, font_size) -> tuple[tuple[str, ...], float]:
+    """The wrapped lines of a cell and how far the widest one runs past the available width (0 if none does)."""
+    text = str(text) if text else ""
     if not text:
-        return [""]
+        return ("",), 0.0
+    return _layout_lines(text, available_width_for_text, font_name, font_size)
+
+@lru_cache(maxsize=settings.LAYOUT_CACHE_SIZE)
+def _layout_lines(text: str, available_width_for_text, font_name, font_size) -> tuple[tuple[str, ...], float]:
+    # The same labels, names and paragraphs are wrapped by both passes of my_table
+    # and by every document of a generate() run, so layouts are cached
+    with span("my_table.wrap"):
+        lines, widest_word = _wrap_words_checked(text, available_width_for_text, font_name, font_size)
+        return tuple(lines), max(0.0, widest_word - available_width_for_text)
+
+def layout_cache_info():
+    """Hits, misses and size of the text layout cache (functools CacheInfo)."""
+    return _layout_lines.cache_info()
+
+def clear_layout_cache():
+    """Empties the text layout cache and resets its counters."""
+    _layout_lines.cache_clear()
+
+# Sums of per-word widths may differ from a width measured in one go by float rounding.
+# Widths this close to the limit are measured again on the whole line.
+_WIDTH_TOLERANCE = 1e-6
+
+def _wrap_words(text, available_width_for_text, font_name, font_size) -> list[str]:
+    return _wrap_words_checked(text, available_width_for_text, font_name, font_size)[0]
+
+def _wrap_words_checked(text, available_width_for_text, font_name, font_size) -> tuple[list[str], float]:
+    # Each word is measured once and line widths are kept as running sums,
+    # so wrapping is linear in the length of the text.
+    # Also returns the widest word that starts a line: lines of several words always
+    # fit, so only such a word can be wider than the available width
+    widest_word = 0.0
+    space_width = string_width(" ", font_name, font_size)
 
     lines = []
     # Handle multi-line text input gracefully
-    raw_lines = str(text).split("\n")
-    words = []
-    for line in raw_lines:
-        words.extend(line.split(" "))
-        words.append("\n") # Use '\n' as a sentinel for forced line breaks
-    words.pop() # remove last '\n'
-
-    current_line_words = []
-    for word in words:
-        if word == "\n":
-            lines.append(" ".join(current_line_words))
-            current_line_words = []
-            continue
-
-        potential_line = " ".join(current_line_words + [word])
-        potential_width = pdfmetrics.stringWidth(
-            potential_line, font_name, font_size
-        )
+    for raw_line in str(text).split("\n"):
+        current_line_words = []
+        current_width = 0.0
+        words = raw_line.split(" ")
+        for word, word_width in zip(words, string_widths(words, font_name, font_size)):
+            if not current_line_words:
+                current_line_words.append(word)
+                current_width = word_width
+                widest_word = max(widest_word, word_width)
+                continue
 
-        if potential_width > available_width_for_text and current_line_words:
-            lines.append(" ".join(current_line_words))
-            current_line_words = [word]
-        else:
-            current_line_words.append(word)
+            potential_width = current_width + space_width + word_width
+            if potential_width > available_width_for_text + _WIDTH_TOLERANCE:
+                too_wide = True
+            elif potential_width < available_width_for_text - _WIDTH_TOLERANCE:
+                too_wide = False
+            else:
+                potential_line = " ".join(current_line_words + [word])
+                too_wide = string_width(potential_line, font_name, font_size) > available_width_for_text
+
+            if too_wide:
+                lines.append(" ".join(current_line_words))
+                current_line_words = [word]
+                current_width = word_width
+                widest_word = max(widest_word, word_width)
+            else:
+                current_line_words.append(word)
+                current_width = potential_width
 
-    if current_line_words:
         lines.append(" ".join(current_line_words))
 
-    # If the input was empty or just whitespace, ensure we return one empty line
-    return lines if lines else [""]
+    return lines, widest_word
 
 def _guess_the_widths(headers: list[str], font_name, font_size, text_padding, center_table, x):
     widths = []
-    for line in headers:
-        widths.append( pdfmetrics.stringWidth(line, font_name, font_size) + (2.01* text_padding))
+    for line_width in string_widths(headers, font_name, font_size):
+        widths.append(line_width + (2.01* text_padding))
     if center_table:
         if sum(widths) > A4[0]:
             widths[-1] = 19*cm - sum(widths[:-1])
@@ -62,184 +107,546 @@ def _guess_the_widths(headers: list[str], font_name, font_size, text_padding, ce
 
     return widths
 
-def my_table(
-    c: canvas.Canvas,
-    data: list[list[str]],
+# Tables with more rows than this are sized from an evenly spread sample (or, for
+# iterators, from their first rows), so auto sizing does not scan the whole table
+_AUTO_WIDTH_SAMPLE_ROWS = 500
+
+def _sample_rows(data, rows: Iterator[list[Any]]) -> tuple[list[tuple[int, list[Any]]], Iterator[list[Any]]]:
+    """
+    Picks the rows column widths are measured on. Returns them as (row index, row)
+    pairs together with the iterator of all rows the layout continues with.
+    """
+    if isinstance(data, Sequence):
+        step = max(1, -(-len(data) // _AUTO_WIDTH_SAMPLE_ROWS))
+        return [(r, data[r]) for r in range(0, len(data), step)], rows
+    # An iterator can only be sampled from its head, which is kept for the layout
+    head = list(itertools.islice(rows, _AUTO_WIDTH_SAMPLE_ROWS))
+    return list(enumerate(head)), itertools.chain(head, rows)
+
+def _fit_widths(widths: list[float], available: float) -> list[float]:
+    """
+    Shrinks columns to `available` in total. Columns narrower than an even share
+    keep their width, the wider ones give up space in proportion to their width.
+    """
+    if sum(widths) <= available:
+        return widths
+    flexible = set(range(len(widths)))
+    remaining = available
+    while flexible:
+        share = remaining / len(flexible)
+        narrow = {i for i in flexible if widths[i] <= share}
+        if not narrow:
+            break
+        remaining -= sum(widths[i] for i in narrow)
+        flexible -= narrow
+    scale = remaining / sum(widths[i] for i in flexible)
+    return [width * scale if i in flexible else width for i, width in enumerate(widths)]
+
+def _content_widths(
+    sample: list[tuple[int, list[Any]]],
+    grid: "MergeGrid",
+    font_name, font_size, text_padding, center_table, x,
+) -> list[float]:
+    """Column widths that fit the widest line of every sampled cell, within the page width."""
+    widths = [0.0] * grid.columns
+    for r_idx, row_data in sample:
+        owners = grid.row(r_idx)
+        for c_idx, cell_text in enumerate(row_data[:grid.columns]):
+            if owners is not None and owners[c_idx] != -1:
+                # Merged cells spread over several columns, they do not size one
+                continue
+            text = str(cell_text) if cell_text else ""
+            widths[c_idx] = max(widths[c_idx], *string_widths(text.split("\n"), font_name, font_size))
+    widths = [width + (2.01* text_padding) for width in widths]
+    # Same page area _guess_the_widths fits the last column to
+    available = 19*cm if center_table else 19*cm - x
+    return _fit_widths(widths, available)
+
+class CellLayout:
+    """
+    A cell to draw: its left edge, size (merged cells span columns and rows) and wrapped text.
+    `overflow` is how far a word too long to wrap runs past the padding, 0 when the text fits.
+    """
+    __slots__ = ("x", "width", "height", "lines", "overflow")
+
+    def __init__(self, x: float, width: float, height: float, lines: list[str], overflow: float = 0.0):
+        self.x = x
+        self.width = width
+        self.height = height
+        self.lines = lines
+        self.overflow = overflow
+
+
+class RowLayout:
+    """
+    A laid out row. `y` is its top edge on the page it is drawn on, `page_break`
+    tells whether a new page starts before it. `header_height` is set on the
+    first row of a table with a header and spans merged header rows.
+    """
+    __slots__ = ("y", "height", "page_break", "header_height", "cells")
+
+    def __init__(self, y: float, height: float, page_break: bool, header_height: float | None, cells: list[CellLayout]):
+        self.y = y
+        self.height = height
+        self.page_break = page_break
+        self.header_height = header_height
+        self.cells = cells
+
+
+class TableLayout:
+    """
+    Where every row and cell of a table goes, computed without a canvas by
+    layout_table and drawn by render_table. A layout can be measured (page_count,
+    break_rows, total_height) and rendered onto any number of canvases.
+    """
+    __slots__ = ("x", "y", "col_widths", "font_name", "font_size", "line_height", "padding_h", "rows")
+
+    def __init__(self, x: float, y: float, col_widths: list[float], font_name: str, font_size: float, padding_h: float):
+        self.x = x
+        self.y = y
+        self.col_widths = col_widths
+        self.font_name = font_name
+        self.font_size = font_size
+        self.line_height = font_size * 1.2
+        self.padding_h = padding_h
+        self.rows: list[RowLayout] | Iterator[RowLayout] = []
+
+    @property
+    def table_width(self) -> float:
+        return sum(self.col_widths)
+
+    @property
+    def break_rows(self) -> list[int]:
+        """Indices of the rows that start a new page."""
+        return [i for i, row in enumerate(self.rows) if row.page_break]
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages the table is drawn on, counting the one it starts on."""
+        return 1 + sum(row.page_break for row in self.rows)
+
+    @property
+    def total_height(self) -> float:
+        """Sum of all row heights, regardless of page breaks."""
+        return sum(row.height for row in self.rows)
+
+    @property
+    def end_y(self) -> float:
+        """The y just below the last row, what my_table returns."""
+        if not self.rows:
+            return self.y
+        last = self.rows[-1]
+        return last.y - last.height
+
+
+class MergeGrid:
+    """
+    The merged cells of a table in one flat, row-major array: for every cell covered
+    by a merge the index of that merge, -1 for a plain cell. Only the rows down to the
+    last merged one are allocated. Overlapping or malformed merges raise ValueError.
+    """
+    __slots__ = ("columns", "rows", "owners", "merges")
+
+    def __init__(self, merge_cells: list[tuple[tuple[int, int], tuple[int, int]]] | None, columns: int):
+        self.columns = columns
+        # (start_row, start_col, end_row, end_col) in the order they were given
+        self.merges: list[tuple[int, int, int, int]] = []
+        for (start_row, start_col), (end_row, end_col) in merge_cells or ():
+            if not 0 <= start_row <= end_row or not 0 <= start_col <= end_col:
+                raise ValueError(
+                    f"Invalid merge ({start_row}, {start_col}) -> ({end_row}, {end_col}): "
+                    "the end cell must not be above or left of the start cell"
+                )
+            if end_col >= columns:
+                raise ValueError(
+                    f"Merge ({start_row}, {start_col}) -> ({end_row}, {end_col}) "
+                    f"reaches past the last of {columns} columns"
+                )
+            self.merges.append((start_row, start_col, end_row, end_col))
+
+        self.rows = max((merge[2] for merge in self.merges), default=-1) + 1
+        self.owners = array("i", [-1]) * (self.rows * columns)
+        for index, (start_row, start_col, end_row, end_col) in enumerate(self.merges):
+            for r in range(start_row, end_row + 1):
+                base = r * columns
+                for col in range(start_col, end_col + 1):
+                    other = self.owners[base + col]
+                    if other != -1:
+                        raise ValueError(f"Merges {self._describe(other)} and {self._describe(index)} overlap at ({r}, {col})")
+                    self.owners[base + col] = index
+
+    def _describe(self, index: int) -> str:
+        start_row, start_col, end_row, end_col = self.merges[index]
+        return f"({start_row}, {start_col}) -> ({end_row}, {end_col})"
+
+    def row(self, r: int) -> memoryview | None:
+        """The owners of the cells of row `r`, None if no merge reaches that row."""
+        if r >= self.rows:
+            return None
+        return memoryview(self.owners)[r * self.columns : (r + 1) * self.columns]
+
+    def is_covered(self, r: int, col: int) -> bool:
+        """True for cells hidden by a merge, i.e. covered but not its top-left cell."""
+        if r >= self.rows:
+            return False
+        owner = self.owners[r * self.columns + col]
+        return owner != -1 and self.merges[owner][:2] != (r, col)
+
+    def span_of(self, r: int, col: int) -> tuple[int, int] | None:
+        """The end cell of the merge that starts at (r, col), None if no merge starts there."""
+        if r >= self.rows:
+            return None
+        owner = self.owners[r * self.columns + col]
+        if owner == -1 or self.merges[owner][:2] != (r, col):
+            return None
+        return self.merges[owner][2:]
+
+
+def layout_table(
+    data: Iterable[list[Any]],
     x: float,
     y: float,
     col_widths: list[float] | None,
     margins: dict[str, float] | int | None | bool= None,
     merge_cells: list[tuple[tuple[int, int], tuple[int, int]]] | None = None,
     has_header: bool = False,
-    has_border: bool = True,
-    align: str = "Left",
     center_table: bool = False,
     font_size: int = 10,
     padding: int | None | bool = None,
-) -> float:
+    fit_content: bool = False,
+) -> TableLayout:
     """
-    Draws a table on the canvas with support for merged cells.
-    Returns curent_y
-
-    Args:
-        c: The ReportLab canvas object.
-        data: A list of lists containing the table data as strings.
-        x: The left x-coordinate of the table.
-        y: The top y-coordinate of the table.
-        col_widths: A list of widths for each column.
-        margins: A dictionary for page margins, e.g., {"up": 2.5*cm, "down": 2.5*cm}.
-        merge_cells: A list of merges, each defined by a tuple of two tuples:
-                     ((start_row, start_col), (end_row, end_col)).
-        has_header: If True, the first row is styled as a header.
-        center_table: Ignores x and centeres the table on canvas
+    Lays out a table without drawing it. Takes the same arguments as my_table
+    (minus the canvas and the purely visual ones) and returns a TableLayout for render_table.
     """
+    table = _layout_table(data, x, y, col_widths, margins, merge_cells, has_header, center_table, font_size, padding, fit_content)
+    table.rows = list(table.rows)
+    return table
+
+
+def _layout_table(data, x, y, col_widths, margins, merge_cells, has_header, center_table, font_size, padding, fit_content) -> TableLayout:
+    # Returns a TableLayout whose rows are laid out lazily while they are iterated
     if margins is None:
         margins = {"left": 1 * cm, "right": 1 * cm, "up": 2.5 * cm, "down": 2.5 * cm}
     if margins == False:
         margins = {"left": 0, "right": 0, "up": 0, "down": 0}
 
-
     FONT_NAME = settings.FONT_NAME
     FONT_SIZE = font_size
-    LINE_HEIGHT = FONT_SIZE * 1.2
     TEXT_PADDING_H = 2 * mm
-    TEXT_PADDING_V = 2.6 * mm
 
     if padding == False:
         TEXT_PADDING_H = 0
 
-    c.setFont(FONT_NAME, FONT_SIZE)
-
-    # TODO: make it look deeper than first list
-    if not col_widths:
-        col_widths = _guess_the_widths(data[0], FONT_NAME, FONT_SIZE, TEXT_PADDING_H, center_table, x)
+    # Rows are consumed lazily, so only the rows that are not drawn yet are kept in memory
+    rows = iter(data)
+    first_row = next(rows, None)
+    if first_row is None:
+        return TableLayout(x, y, col_widths or [], FONT_NAME, FONT_SIZE, TEXT_PADDING_H)
+
+    # Built here rather than in the lazy _layout_rows, so bad merges are reported right away
+    grid = MergeGrid(merge_cells, len(col_widths) if col_widths else len(first_row))
+    rows = itertools.chain([first_row], rows)
+    if not col_widths and fit_content:
+        sample, rows = _sample_rows(data, rows)
+        col_widths = _content_widths(sample, grid, FONT_NAME, FONT_SIZE, TEXT_PADDING_H, center_table, x)
+    elif not col_widths:
+        col_widths = _guess_the_widths(first_row, FONT_NAME, FONT_SIZE, TEXT_PADDING_H, center_table, x)
     if center_table and col_widths:
         x = (A4[0] - sum(col_widths)) / 2
 
-    # --- Pre-computation Step: Create maps for merged cells ---
-    merge_map = {}  # Maps a start cell (r,c) to its end cell (r,c)
-    skip_cells = set()  # A set of all cells to skip drawing
-    if merge_cells:
-        for start, end in merge_cells:
-            start_row, start_col = start
-            end_row, end_col = end
-            merge_map[(start_row, start_col)] = (end_row, end_col)
-            # Add all cells covered by the merge, except the top-left one, to skip_cells
-            for r in range(start_row, end_row + 1):
-                for col in range(start_col, end_col + 1):
-                    if (r, col) != (start_row, start_col):
-                        skip_cells.add((r, col))
-
-    # --- Pass 1: Calculate Row Heights ---
-    row_heights = [0] * len(data)
-    for r_idx, row_data in enumerate(data):
+    table = TableLayout(x, y, col_widths, FONT_NAME, FONT_SIZE, TEXT_PADDING_H)
+    table.rows = _layout_rows(table, rows, margins, grid, has_header)
+    return table
+
+
+def _layout_rows(
+    table: TableLayout,
+    data: Iterator[list[Any]],
+    margins: dict[str, float],
+    grid: MergeGrid,
+    has_header: bool,
+) -> Iterator[RowLayout]:
+    FONT_NAME = table.font_name
+    FONT_SIZE = table.font_size
+    LINE_HEIGHT = table.line_height
+    TEXT_PADDING_H = table.padding_h
+    TEXT_PADDING_V = 2.6 * mm
+    col_widths = table.col_widths
+
+    # Merges are applied in order once all their rows are read. A row's height is final
+    # when every merge starting at or above it has been applied.
+    merges = grid.merges
+    pending_start = [float("inf")] * (len(merges) + 1)  # smallest start row among merges[i:]
+    for i in range(len(merges) - 1, -1, -1):
+        pending_start[i] = min(merges[i][0], pending_start[i + 1])
+    # Last row a row needs to know the height of before it can be placed
+    span_end: dict[int, int] = {}
+    for start_row, _, end_row, _ in merges:
+        span_end[start_row] = max(span_end.get(start_row, start_row), end_row)
+
+    buffered_rows: dict[int, list[Any]] = {}
+    row_lines: dict[int, dict[int, tuple[tuple[str, ...], float]]] = {}  # Wrapped text of every cell of the waiting rows
+    row_heights: dict[int, float] = {}
+    applied = 0
+    next_row = 0
+    current_y = table.y
+
+    def _layout_row(r_idx, row_data):
+        # --- Pass 1: Calculate Row Heights ---
+        lines = row_lines[r_idx] = {}
+        owners = grid.row(r_idx)
         max_cell_height_in_row = 0
         for c_idx, cell_text in enumerate(row_data):
-            if (r_idx, c_idx) in skip_cells:
+            if owners is not None and owners[c_idx] != -1:
+                # Covered by a merge, or the start of one: merged cells are
+                # handled separately to avoid double counting
                 continue
 
-            # Check if this cell is the start of a merge
-            if (r_idx, c_idx) in merge_map:
-                # This is a merged cell, skip height calculation for now
-                # It will be handled separately to avoid double counting
-                continue
-            else:
-                # This is a regular cell
-                available_width = col_widths[c_idx] - (2 * TEXT_PADDING_H)
-                wrapped_lines = _split_text_for_cell(
-                    cell_text, available_width, FONT_NAME, FONT_SIZE
-                )
-                cell_height = len(wrapped_lines) * LINE_HEIGHT + (2 * TEXT_PADDING_V)
-                max_cell_height_in_row = max(max_cell_height_in_row, cell_height)
+            # This is a regular cell
+            available_width = col_widths[c_idx] - (2 * TEXT_PADDING_H)
+            wrapped_lines, _ = lines[c_idx] = _wrap_cell(
+                cell_text, available_width, FONT_NAME, FONT_SIZE
+            )
+            cell_height = len(wrapped_lines) * LINE_HEIGHT + (2 * TEXT_PADDING_V)
+            max_cell_height_in_row = max(max_cell_height_in_row, cell_height)
 
-        row_heights[r_idx] = max(row_heights[r_idx], max_cell_height_in_row)
+        row_heights[r_idx] = max_cell_height_in_row
 
-    # Now, handle the heights of vertically merged cells
-    for start_cell, end_cell in merge_map.items():
-        start_row, start_col = start_cell
-        end_row, end_col = end_cell
+    def _apply_merge(start_row, start_col, end_row, end_col):
+        # Now, handle the heights of merged cells
+        cell_text = buffered_rows[start_row][start_col]
+        merged_width = sum(col_widths[start_col : end_col + 1])
+        available_width = merged_width - (2 * TEXT_PADDING_H)
+        wrapped_lines, _ = row_lines[start_row][start_col] = _wrap_cell(
+            cell_text, available_width, FONT_NAME, FONT_SIZE
+        )
+        required_height = len(wrapped_lines) * LINE_HEIGHT + (2 * TEXT_PADDING_V)
 
         # We only need to adjust heights for vertical spans
         if start_row == end_row:
             # For horizontal-only merges, ensure the row is tall enough
-            cell_text = data[start_row][start_col]
-            merged_width = sum(col_widths[start_col : end_col + 1])
-            available_width = merged_width - (2 * TEXT_PADDING_H)
-            wrapped_lines = _split_text_for_cell(
-                cell_text, available_width, FONT_NAME, FONT_SIZE
-            )
-            cell_height = len(wrapped_lines) * LINE_HEIGHT + (2 * TEXT_PADDING_V)
-            row_heights[start_row] = max(row_heights[start_row], cell_height)
+            row_heights[start_row] = max(row_heights[start_row], required_height)
         else:
             # For vertical merges, check if the combined rows are tall enough
-            cell_text = data[start_row][start_col]
-            merged_width = sum(col_widths[start_col : end_col + 1])
-            available_width = merged_width - (2 * TEXT_PADDING_H)
-            wrapped_lines = _split_text_for_cell(
-                cell_text, available_width, FONT_NAME, FONT_SIZE
-            )
-            required_height = len(wrapped_lines) * LINE_HEIGHT + (2 * TEXT_PADDING_V)
-
-            current_span_height = sum(row_heights[start_row : end_row + 1])
+            current_span_height = sum(row_heights[r] for r in range(start_row, end_row + 1))
 
             if required_height > current_span_height:
                 # Distribute the needed extra height to the last row in the span
                 extra_height = required_height - current_span_height
                 row_heights[end_row] += extra_height
 
-    # --- Pass 2: Drawing ---
-    current_y = y
-    table_width = sum(col_widths)
-
-    for r_idx, row_data in enumerate(data):
+    def _place_row(r_idx, row_data) -> RowLayout:
+        # --- Pass 2: Positions ---
+        nonlocal current_y
         row_height = row_heights[r_idx]
 
         # Page break check
-        if current_y - row_height < margins["down"]:
-            c.showPage()
-            c.setFont(FONT_NAME, FONT_SIZE) # Reset font on new page
+        page_break = current_y - row_height < margins["down"]
+        if page_break:
             current_y = A4[1] - margins["up"]
 
-        # row_y_bottom = current_y - row_height
-        current_x = x
-
-        # Draw header background if applicable
+        header_height = None
         if has_header and r_idx == 0:
-            c.setFillColor(colors.lightgrey)
             # We need to calculate header height in case it's part of a merge
             header_end_row = 0
-            if (0, 0) in merge_map:
-                header_end_row = merge_map[(0, 0)][0]
-            header_height = sum(row_heights[0 : header_end_row + 1])
-            c.rect(x, current_y - header_height, table_width, header_height, fill=1, stroke=0)
-            c.setFillColor(colors.black)
-
-        for c_idx, cell_text in enumerate(row_data):
+            header_span = grid.span_of(0, 0)
+            if header_span is not None:
+                header_end_row = header_span[0]
+            header_height = sum(row_heights[r] for r in range(0, header_end_row + 1))
+
+        cells = []
+        lines = row_lines.pop(r_idx)
+        owners = grid.row(r_idx)
+        current_x = table.x
+        for c_idx in range(len(row_data)):
             col_width = col_widths[c_idx]
 
-            if (r_idx, c_idx) in skip_cells:
-                current_x += col_width
-                continue
-
             # Determine cell dimensions
             draw_width = col_width
             draw_height = row_height
-            if (r_idx, c_idx) in merge_map:
-                end_row, end_col = merge_map[(r_idx, c_idx)]
+            if owners is not None and owners[c_idx] != -1:
+                start_row, start_col, end_row, end_col = merges[owners[c_idx]]
+                if start_row != r_idx or start_col != c_idx:
+                    # Hidden under a merge that starts elsewhere
+                    current_x += col_width
+                    continue
                 draw_width = sum(col_widths[c_idx : end_col + 1])
-                draw_height = sum(row_heights[r_idx : end_row + 1])
+                draw_height = sum(row_heights[r] for r in range(r_idx, end_row + 1))
+
+            cell_lines, overflow = lines[c_idx]
+            cells.append(CellLayout(current_x, draw_width, draw_height, list(cell_lines), overflow))
+            current_x += col_width
+
+        row = RowLayout(current_y, row_height, page_break, header_height, cells)
+        current_y -= row_height
+        return row
+
+    def _ready_rows(last_read) -> Iterator[RowLayout]:
+        # Applies the merges whose rows are all read and places every row whose height is final
+        nonlocal applied, next_row
+        while applied < len(merges) and merges[applied][2] <= last_read:
+            _apply_merge(*merges[applied])
+            applied += 1
+        while next_row <= last_read:
+            needed = span_end.get(next_row, next_row)
+            if needed > last_read or pending_start[applied] <= needed:
+                break
+            yield _place_row(next_row, buffered_rows.pop(next_row))
+            # Rows below the placed one never look back at its height
+            del row_heights[next_row]
+            next_row += 1
+
+    r_idx = -1
+    for r_idx, row_data in enumerate(data):
+        buffered_rows[r_idx] = row_data
+        with span("my_table.layout"):
+            _layout_row(r_idx, row_data)
+            ready = list(_ready_rows(r_idx))
+        yield from ready
+
+    if applied < len(merges):
+        raise ValueError(f"Merge {grid._describe(applied)} reaches past the last row ({r_idx})")
+
+
+class _ColorState:
+    """The fill and stroke colours render_table last set on the current page, so unchanged ones are skipped."""
+    __slots__ = ("c", "fill", "stroke")
+
+    def __init__(self, c: canvas.Canvas):
+        self.c = c
+        self.reset()
+
+    def reset(self):
+        # Unknown, e.g. at the start of a table or on a new page
+        self.fill = None
+        self.stroke = None
+
+    def set_fill(self, color: colors.Color):
+        if self.fill != color:
+            self.c.setFillColor(color)
+            self.fill = color
+
+    def set_stroke(self, color: colors.Color):
+        if self.stroke != color:
+            self.c.setStrokeColor(color)
+            self.stroke = color
+
+
+def _draw_text_runs(
+    c: canvas.Canvas | RecordingCanvas,
+    runs: list[tuple[float, float, list[str]]],
+    centred: bool,
+    font_name: str,
+    font_size: float,
+    leading: float,
+):
+    """
+    Draws the lines of several cells in one text object. Each run is (x, y, lines)
+    with y the baseline of the first line, the following lines move down by the leading
+    set with the font. Centred lines are each placed where drawCentredString puts them.
+    """
+    if isinstance(c, DryRunCanvas):
+        c.count_text(line for _, _, lines in runs for line in lines)
+        return
+    if isinstance(c, RecordingCanvas):
+        c.record(_draw_text_runs, runs, centred, font_name, font_size, leading)
+        return
+
+    text = c.beginText()
+    for x, y, lines in runs:
+        if not centred:
+            text.setTextOrigin(x, y)
+            for line in lines:
+                text.textLine(line)
+            continue
+
+        for line in lines:
+            text.setTextOrigin(x - 0.5 * string_width(line, font_name, font_size), y)
+            text.textLine(line)
+            y -= leading
+    c.drawText(text)
+
+
+# Distance from a border at which text touches its stroke, with room for wider lines than the default 1 pt
+_BORDER_CLEARANCE = 1.0
+
+def _render_row_by_cell(
+    c: canvas.Canvas,
+    table: TableLayout,
+    row: RowLayout,
+    state: _ColorState,
+    centred: bool,
+) -> float:
+    """
+    Draws each cell's border and then its text, so the border of the next cell still
+    paints over text that runs into it. Used for the rows whose text reaches a border,
+    where batching the row's text would change what is on top.
+    Returns the y below the row.
+    """
+    text_y = row.y - table.font_size - table.padding_h
+    for cell in row.cells:
+        state.set_stroke(colors.grey)
+        c.rect(cell.x, row.y - cell.height, cell.width, cell.height)
+        if not any(cell.lines):
+            continue
+        x = cell.x + (cell.width / 2) if centred else cell.x + table.padding_h
+        state.set_fill(colors.black)
+        _draw_text_runs(c, [(x, text_y, cell.lines)], centred, table.font_name, table.font_size, table.line_height)
+    return row.y - row.height
+
+
+def render_table(
+    c: canvas.Canvas,
+    table: TableLayout,
+    has_border: bool = True,
+    align: str = "Left",
+) -> float:
+    """
+    Draws a TableLayout on the canvas, adding pages where it breaks. Returns the y below the table.
+    The text of a row goes into one text object, and colours are only set when they change.
+    Rows where text can reach a border are drawn cell by cell, see _render_row_by_cell.
+    """
+    FONT_NAME = table.font_name
+    FONT_SIZE = table.font_size
+    LINE_HEIGHT = table.line_height
+    TEXT_PADDING_H = table.padding_h
+    x = table.x
+    table_width = table.table_width
+    centred = align == "center"
+
+    # The leading moves the text objects from one line of a cell to the next
+    c.setFont(FONT_NAME, FONT_SIZE, leading=LINE_HEIGHT)
+    state = _ColorState(c)
+    # How far text may run past the padding before it reaches the stroke of a border,
+    # centred text runs past both sides
+    reach = TEXT_PADDING_H - _BORDER_CLEARANCE
+    if centred:
+        reach *= 2
+    current_y = table.y
+    for row in table.rows:
+        with span("my_table.draw"):
+            if row.page_break:
+                c.showPage()
+                c.setFont(FONT_NAME, FONT_SIZE, leading=LINE_HEIGHT) # Reset font on new page
+                state.reset()
+            current_y = row.y
+
+            # Draw header background if applicable
+            if row.header_height is not None:
+                state.set_fill(colors.lightgrey)
+                c.rect(x, current_y - row.header_height, table_width, row.header_height, fill=1, stroke=0)
+
+            if has_border and any(cell.overflow > reach for cell in row.cells):
+                # Text reaches a border here
+                current_y = _render_row_by_cell(c, table, row, state, centred)
+                continue
 
-            # Draw cell border
+            # Draw cell borders
             if has_border:
-                c.setStrokeColor(colors.grey)
-                c.rect(current_x, current_y - draw_height, draw_width, draw_height)
-
-            # Draw cell text
-            c.setFillColor(colors.black)
-            available_text_width = draw_width - (2 * TEXT_PADDING_H)
-            wrapped_lines = _split_text_for_cell(
-                cell_text, available_text_width, FONT_NAME, FONT_SIZE
-            )
+                state.set_stroke(colors.grey)
+                for cell in row.cells:
+                    c.rect(cell.x, current_y - cell.height, cell.width, cell.height)
 
             # # Vertically center the text block
             # text_block_height = len(wrapped_lines) * LINE_HEIGHT
@@ -249,19 +656,65 @@ def my_table(
             # Verticall align topd
             text_y = current_y - FONT_SIZE - TEXT_PADDING_H
 
-            for line in wrapped_lines:
-                match align:
-                    case "center":
-                        c.drawCentredString(current_x + (draw_width / 2), text_y, line)
-                    case _:
-                        c.drawString(current_x + TEXT_PADDING_H, text_y, line)
-                text_y -= LINE_HEIGHT
-
-            current_x += col_width
-        current_y -= row_height
+            # Draw cell text, cells without any text are left out
+            runs = []
+            for cell in row.cells:
+                if not any(cell.lines):
+                    continue
+                if centred:
+                    runs.append((cell.x + (cell.width / 2), text_y, cell.lines))
+                else:
+                    runs.append((cell.x + TEXT_PADDING_H, text_y, cell.lines))
+            state.set_fill(colors.black)
+            if runs:
+                _draw_text_runs(c, runs, centred, FONT_NAME, FONT_SIZE, LINE_HEIGHT)
+
+            current_y -= row.height
     return current_y
 
 
+def my_table(
+    c: canvas.Canvas,
+    data: Iterable[list[Any]],
+    x: float,
+    y: float,
+    col_widths: list[float] | None,
+    margins: dict[str, float] | int | None | bool= None,
+    merge_cells: list[tuple[tuple[int, int], tuple[int, int]]] | None = None,
+    has_header: bool = False,
+    has_border: bool = True,
+    align: str = "Left",
+    center_table: bool = False,
+    font_size: int = 10,
+    padding: int | None | bool = None,
+    fit_content: bool = False,
+) -> float:
+    """
+    Draws a table on the canvas with support for merged cells.
+    Same as render_table(c, layout_table(...)), without keeping the whole layout in memory.
+    Returns curent_y
+
+    Args:
+        c: The ReportLab canvas object.
+        data: The rows of the table, any iterable of lists (e.g. a generator).
+              Rows are laid out and drawn as they arrive, so only rows that are
+              waiting for a vertical merge to end are kept in memory.
+        x: The left x-coordinate of the table.
+        y: The top y-coordinate of the table.
+        col_widths: A list of widths for each column.
+        margins: A dictionary for page margins, e.g., {"up": 2.5*cm, "down": 2.5*cm}.
+        merge_cells: A list of merges, each defined by a tuple of two tuples:
+                     ((start_row, start_col), (end_row, end_col)).
+        has_header: If True, the first row is styled as a header.
+        center_table: Ignores x and centeres the table on canvas
+        fit_content: Without col_widths, size the columns to fit the content of the rows
+                     instead of the first row. Large tables are sized from a sample of rows.
+                     The columns are shrunk to fit the page, narrow ones keep their width.
+    """
+    table = _layout_table(data, x, y, col_widths, margins, merge_cells, has_header, center_table, font_size, padding, fit_content)
+    return render_table(c, table, has_border, align)
+
+
 # Example Usage:
 if __name__ == "__main__":
     c = canvas.Canvas("custom_table_with_merges.pdf", pagesize=A4)
@@ -0,0 +1,111 @@
+# src/pdf_generation/tracing.py
+"""
+Lightweight timing spans for the generation pipeline.
+
+Usage:
+    with tracing.collect() as report:
+        generate(data, output_dir)
+    print(report["my_table.layout"]["p95"])
+
+Tracing is off by default. While it is off `span()` hands out one shared no-op
+context manager, so instrumented code pays for a single function call.
+Spans recorded inside worker processes (generate(workers=N)) are not collected.
+"""
+import json
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Iterator
+
+_enabled = False
+_durations: defaultdict[str, list[float]] = defaultdict(list)
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        _durations[self.name].append(time.perf_counter() - self.start)
+        return False
+
+
+def span(name: str):
+    """Returns a context manager that records the duration of its block under `name`."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Forgets all recorded spans."""
+    _durations.clear()
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    # Nearest-rank percentile, good enough for timing reports
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def report() -> dict[str, dict[str, Any]]:
+    """Aggregates the recorded spans: count, total, p50 and p95 (in seconds) per span name."""
+    result = {}
+    for name, durations in sorted(_durations.items()):
+        values = sorted(durations)
+        result[name] = {
+            "count": len(values),
+            "total": sum(values),
+            "p50": _percentile(values, 0.50),
+            "p95": _percentile(values, 0.95),
+        }
+    return result
+
+
+def dump_json(output_path: str, trace_report: dict[str, dict[str, Any]] | None = None):
+    """Writes `trace_report` (or the current report) to a JSON file."""
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(trace_report if trace_report is not None else report(), f, indent=4)
+
+
+@contextmanager
+def collect() -> Iterator[dict[str, dict[str, Any]]]:
+    """
+    Enables tracing for the block and yields a dict that is filled with the
+    report of that block when it exits. The previous tracing state is restored.
+    """
+    global _enabled
+    was_enabled = _enabled
+    saved = {name: list(durations) for name, durations in _durations.items()}
+    _durations.clear()
+    _enabled = True
+    trace_report: dict[str, dict[str, Any]] = {}
+    try:
+        yield trace_report
+    finally:
+        trace_report.update(report())
+        _enabled = was_enabled
+        _durations.clear()
+        _durations.update(saved)
@@ -1,6 +1,7 @@
 # src/project_managment/manager.py
 import os
 import platform
+import sqlite3
 import subprocess
 import json
 from typing import Dict, Any, Tuple
@@ -10,6 +11,7 @@ from src.project_managment.file_ops import load_json_data, save_json_data, copy_
 from src.data_conversion.json_builder import create_initial_json
 from src.pdf_generation.generator import generate
 from src.data_conversion.ankieta_ods import parse_ankieta_ewaluacyjna
+from src.data_conversion.survey_store import SurveyStore, file_hash
 
 
 class ProjectManager:
@@ -90,7 +92,17 @@ class ProjectManager:
         # Create new json from the copied ODS
         json_path = os.path.join(self.directory, settings.ANKIETA_EWALUACYJNA_OUTPUT)
         # create_initial_json(destination_path, json_path)
-        parse_ankieta_ewaluacyjna(destination_path, json_path)
+        # A survey form of its own can be described by a schema in the training directory
+        schema_path = os.path.join(self.directory, settings.SURVEY_SCHEMA_FILENAME)
+        summary = parse_ankieta_ewaluacyjna(destination_path, json_path, schema_path if os.path.isfile(schema_path) else None)
+
+        # Keep the results for trends across trainings
+        data = load_json_data(os.path.join(self.directory, settings.DATA_FILENAME)) or {}
+        try:
+            with SurveyStore() as store:
+                store.add_survey(file_hash(destination_path), summary, data.get(settings.KEY_TRAINING), source=destination_path)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Could not add the survey to {settings.SURVEY_STORE_PATH}: {e}")
         
         # Load and return the newly created data
         return True
@@ -132,8 +144,7 @@ class ProjectManager:
             force=force
         )
 
-        # Save the data back to file if timestamps were added/changed
-        # if updated_data != data:
-        #     self.save_project_data(updated_data)
+        # Save the data back to file so the next run can skip unchanged documents
+        self.save_project_data(updated_data, save_as_compare=True)
 
-        # return updated_data
+        return updated_data